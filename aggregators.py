@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 17:05:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 17:05:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: aggregators
+
+***********
+Aggregators
+***********
+
+Streaming, bounded memory statistics over Monte Carlo batches of scenario results (see runner
+module).
+Every aggregator can be filled in worker processes and merged into a single one afterwards.
+
+Example, stopping as soon as hit probability is known within +/-1%::
+
+    mca = aggregate(runner.imap_scenarios(scenarios), hit_halfwidth=0.01)
+    print(mca.summary())
+
+    """
+
+import numpy as np
+
+import runner
+
+# normal distribution quantile for 95% confidence intervals
+Z95 = 1.959963984540054
+
+
+class RunningStats:
+    """
+======================
+The RunningStats class
+======================
+
+.. class:: RunningStats()
+
+    Create a RunningStats instance keeping count, mean, variance (Welford), min and max of
+    added samples.
+
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.
+        self._m2 = 0.
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, x):
+        """
+.. method:: add(x)
+
+        Add :samp:`x` sample.
+
+        """
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other):
+        """
+.. method:: merge(other)
+
+        Merge :samp:`other` RunningStats samples into self.
+
+        """
+        n = self.n + other.n
+        if not n:
+            return
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta**2 * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self):
+        """
+.. method:: variance()
+
+        Return samples variance.
+
+        """
+        return self._m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    def ci(self, z=Z95):
+        """
+.. method:: ci(z=Z95)
+
+        Return (low, high) confidence interval of the mean.
+
+        """
+        half = z * np.sqrt(self.variance() / self.n) if self.n > 1 else np.inf
+        return (self.mean - half, self.mean + half)
+
+
+class Histogram:
+    """
+===================
+The Histogram class
+===================
+
+.. class:: Histogram(low, high, bins)
+
+    Create a Histogram instance counting samples in :samp:`bins` equal bins from :samp:`low` to
+    :samp:`high`, plus underflow and overflow counters.
+
+    """
+    def __init__(self, low, high, bins):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = self.overflow = 0
+
+    def add(self, x):
+        """
+.. method:: add(x)
+
+        Add :samp:`x` sample.
+
+        """
+        if x < self.edges[0]:
+            self.underflow += 1
+        elif x >= self.edges[-1]:
+            self.overflow += 1
+        else:
+            self.counts[np.searchsorted(self.edges, x, side='right') - 1] += 1
+
+    def merge(self, other):
+        """
+.. method:: merge(other)
+
+        Merge :samp:`other` Histogram, which must have the same edges, into self.
+
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError('cannot merge histograms with different edges')
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+
+class QuantileSketch:
+    """
+========================
+The QuantileSketch class
+========================
+
+.. class:: QuantileSketch(compression=100)
+
+    Create a QuantileSketch instance: a t-digest like summary made of at most about
+    :samp:`compression` weighted centroids, denser at the distribution tails.
+
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer = []
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, x):
+        """
+.. method:: add(x)
+
+        Add :samp:`x` sample.
+
+        """
+        self._buffer.append(x)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self._buffer) >= self.compression:
+            self._compress()
+
+    def merge(self, other):
+        """
+.. method:: merge(other)
+
+        Merge :samp:`other` QuantileSketch into self.
+
+        """
+        other._compress()
+        self._compress()
+        self._means = np.concatenate([self._means, other._means])
+        self._weights = np.concatenate([self._weights, other._weights])
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(force=True)
+
+    def _compress(self, force=False):
+        if not self._buffer and not force:
+            return
+        means = np.concatenate([self._means, self._buffer])
+        weights = np.concatenate([self._weights, np.ones(len(self._buffer))])
+        self._buffer = []
+        if not len(means):
+            return
+
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        # arcsine scale function: centroids covering the tails hold fewer samples
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        bucket = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        _, first = np.unique(bucket, return_index=True)
+        self._weights = np.add.reduceat(weights, first)
+        self._means = np.add.reduceat(means * weights, first) / self._weights
+
+    def quantile(self, q):
+        """
+.. method:: quantile(q)
+
+        Return estimated :samp:`q` quantile (:samp:`q` may be an array).
+
+        """
+        self._compress()
+        if not len(self._means):
+            return np.nan * np.asarray(q)
+        cum = np.cumsum(self._weights)
+        centers = (cum - self._weights / 2) / cum[-1]
+        return np.interp(q, np.concatenate([[0.], centers, [1.]]),
+                         np.concatenate([[self.min], self._means, [self.max]]))
+
+
+class MonteCarloAggregator:
+    """
+==============================
+The MonteCarloAggregator class
+==============================
+
+.. class:: MonteCarloAggregator(miss_range=(0, 50), miss_bins=100, compression=100)
+
+    Create a MonteCarloAggregator instance summarizing runner.run_scenario results: hit
+    probability, miss distance histogram (:samp:`miss_bins` bins over :samp:`miss_range`) and
+    running statistics plus quantile sketches of every metric in METRICS.
+    Time of flight is only accounted for hits.
+
+    """
+    METRICS = ['miss_distance', 'time_of_flight', 'peak_acc', 'integrated_acc']
+
+    def __init__(self, miss_range=(0, 50), miss_bins=100, compression=100):
+        self.n = 0
+        self.hits = 0
+        self.stats = {m: RunningStats() for m in self.METRICS}
+        self.sketches = {m: QuantileSketch(compression) for m in self.METRICS}
+        self.miss_histogram = Histogram(miss_range[0], miss_range[1], miss_bins)
+
+    def add(self, result):
+        """
+.. method:: add(result)
+
+        Add :samp:`result` run result.
+
+        """
+        self.n += 1
+        self.hits += bool(result['hit'])
+        for m in self.METRICS:
+            if m == 'time_of_flight' and not result['hit']:
+                continue
+            self.stats[m].add(result[m])
+            self.sketches[m].add(result[m])
+        self.miss_histogram.add(result['miss_distance'])
+
+    def merge(self, other):
+        """
+.. method:: merge(other)
+
+        Merge :samp:`other` partial MonteCarloAggregator (e.g. filled in a worker process)
+        into self.
+
+        """
+        self.n += other.n
+        self.hits += other.hits
+        for m in self.METRICS:
+            self.stats[m].merge(other.stats[m])
+            self.sketches[m].merge(other.sketches[m])
+        self.miss_histogram.merge(other.miss_histogram)
+
+    def hit_probability(self):
+        """
+.. method:: hit_probability()
+
+        Return estimated hit probability and its (low, high) Wilson confidence interval.
+
+        """
+        if not self.n:
+            return np.nan, (0., 1.)
+        p = self.hits / self.n
+        den = 1 + Z95**2 / self.n
+        center = (p + Z95**2 / (2 * self.n)) / den
+        half = Z95 * np.sqrt(p * (1 - p) / self.n + Z95**2 / (4 * self.n**2)) / den
+        return p, (center - half, center + half)
+
+    def converged(self, hit_halfwidth=None, rel_halfwidth=None, min_runs=30):
+        """
+.. method:: converged(hit_halfwidth=None, rel_halfwidth=None, min_runs=30)
+
+        Return True once at least :samp:`min_runs` results have been added and:
+
+            * hit probability confidence interval half width is below :samp:`hit_halfwidth`;
+            * every metric mean confidence interval half width is below :samp:`rel_halfwidth`
+              times the mean.
+
+        Criteria set to None are not checked.
+
+        """
+        if self.n < min_runs:
+            return False
+        if hit_halfwidth is not None:
+            lo, hi = self.hit_probability()[1]
+            if (hi - lo) / 2 > hit_halfwidth:
+                return False
+        if rel_halfwidth is not None:
+            for stats in self.stats.values():
+                lo, hi = stats.ci()
+                if stats.n and (hi - lo) / 2 > rel_halfwidth * abs(stats.mean):
+                    return False
+        return True
+
+    def summary(self, quantiles=(0.05, 0.5, 0.95)):
+        """
+.. method:: summary(quantiles=(0.05, 0.5, 0.95))
+
+        Return a dictionary of current estimates with their 95% confidence intervals.
+
+        """
+        p, p_ci = self.hit_probability()
+        summary = {'runs': self.n, 'hit_probability': p, 'hit_probability_ci': p_ci}
+        for m in self.METRICS:
+            summary[m] = {
+                'mean': self.stats[m].mean,
+                'mean_ci': self.stats[m].ci(),
+                'std': np.sqrt(self.stats[m].variance()),
+                'min': self.stats[m].min,
+                'max': self.stats[m].max,
+                'quantiles': dict(zip(quantiles, self.sketches[m].quantile(quantiles)))
+            }
+        return summary
+
+
+def aggregate(results, aggregator=None, check_every=10, progress_fn=None, **criteria):
+    """
+.. function:: aggregate(results, aggregator=None, check_every=10, progress_fn=None, **criteria)
+
+    Add every result (or partial MonteCarloAggregator) yielded by :samp:`results` iterable to
+    :samp:`aggregator` (a new MonteCarloAggregator if None) and return it.
+    If :samp:`criteria` are given (see MonteCarloAggregator.converged) convergence is checked
+    every :samp:`check_every` items and :samp:`results` is no more consumed once reached.
+    :samp:`progress_fn`, if given, is called every :samp:`check_every` items with the current
+    MonteCarloAggregator.summary().
+
+    """
+    mca = aggregator if aggregator is not None else MonteCarloAggregator()
+    for i, item in enumerate(results, 1):
+        if isinstance(item, MonteCarloAggregator):
+            mca.merge(item)
+        else:
+            mca.add(item)
+        if i % check_every:
+            continue
+        if progress_fn is not None:
+            progress_fn(mca.summary())
+        if criteria and mca.converged(**criteria):
+            break
+    return mca
+
+
+def aggregate_chunk(scenarios):
+    """
+.. function:: aggregate_chunk(scenarios)
+
+    Run :samp:`scenarios` in the calling process and return their MonteCarloAggregator: meant to
+    be mapped over chunks of scenarios by worker processes, partial aggregates being merged by
+    aggregate().
+
+    """
+    return aggregate(map(runner.run_scenario, scenarios))
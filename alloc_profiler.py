@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 22:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 22:40:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: alloc_profiler
+
+**************
+Alloc Profiler
+**************
+
+Opt-in allocation instrumentation of a step loop, based on tracemalloc and gc statistics.
+
+The loop marks the beginning of each of its phases and the end of each step::
+
+    prof = AllocationProfiler(window=1000, label='my change')
+    prof.start()
+    while running:
+        prof.mark('physics')
+        ...
+        prof.mark('drawing')
+        ...
+        prof.step()
+    prof.stop()
+    prof.dump('alloc.json')
+
+For every phase the report holds net allocated bytes and memory blocks and the transient
+(peak) bytes allocated inside it; every :samp:`window` steps a tracemalloc snapshot measures
+retained memory growth and its top sources, together with garbage collections.
+Reports of different code versions can be compared with compare().
+
+    """
+
+import gc
+import sys
+import json
+import platform
+import tracemalloc
+
+
+class AllocationProfiler:
+    """
+============================
+The AllocationProfiler class
+============================
+
+.. class:: AllocationProfiler(window=1000, top=10, label=None)
+
+    Create an AllocationProfiler instance taking a retained memory snapshot every
+    :samp:`window` steps and reporting its :samp:`top` growing source lines.
+    :samp:`label` (e.g. a version name) is stored in the report.
+
+    Profiler bookkeeping allocates a constant amount per mark, so reports of the same loop
+    are comparable, but phases are never exactly allocation free.
+    tracemalloc and sys.getallocatedblocks count the whole process: allocations of other
+    threads running meanwhile are charged to the open phase, so they should be kept idle
+    while profiling (see sim.Simulator profiler parameter).
+
+    """
+    def __init__(self, window=1000, top=10, label=None):
+        self.window = window
+        self.top = top
+        self.label = label
+        self.steps = 0
+        self.phases = {}
+        self.windows = []
+        self._phase = None
+        self._start = None
+        self._snapshot = None
+        self._collections = None
+        self._started = False
+
+    def start(self):
+        """
+.. method:: start()
+
+        Start tracing allocations (if tracemalloc is not already tracing).
+
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        self._snapshot = self._take_snapshot()
+        self._collections = self._gc_collections()
+
+    def stop(self):
+        """
+.. method:: stop()
+
+        Close current phase and stop tracing allocations (if started by the profiler).
+
+        """
+        self.mark(None)
+        self._snapshot = None
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ])
+
+    @staticmethod
+    def _gc_collections():
+        return [gen['collections'] for gen in gc.get_stats()]
+
+    def mark(self, phase):
+        """
+.. method:: mark(phase)
+
+        Close current phase, if any, and open :samp:`phase` (None to open nothing).
+
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        if self._phase is not None:
+            stats = self.phases.get(self._phase)
+            if stats is None:
+                stats = self.phases[self._phase] = {'calls': 0, 'net_bytes': 0, 'net_blocks': 0,
+                                                    'peak_bytes': 0}
+            stats['calls'] += 1
+            stats['net_bytes'] += current - self._start[0]
+            stats['net_blocks'] += blocks - self._start[1]
+            stats['peak_bytes'] = max(stats['peak_bytes'], peak - self._start[0])
+        tracemalloc.reset_peak()
+        self._phase = phase
+        self._start = (current, blocks)
+
+    def step(self):
+        """
+.. method:: step()
+
+        Close current phase and count a step, taking a retained memory snapshot at the end of
+        each window.
+
+        """
+        self.mark(None)
+        self.steps += 1
+        if self._snapshot is None or self.steps % self.window:
+            return
+        snapshot = self._take_snapshot()
+        growth = snapshot.compare_to(self._snapshot, 'lineno')
+        collections = self._gc_collections()
+        self.windows.append({
+            'step': self.steps,
+            'traced_bytes': tracemalloc.get_traced_memory()[0],
+            'growth_bytes': sum(stat.size_diff for stat in growth),
+            'growth_blocks': sum(stat.count_diff for stat in growth),
+            'gc_collections': [c - p for c, p in zip(collections, self._collections)],
+            'gc_objects': len(gc.get_objects()),
+            'top_growth': [{'where': '%s:%d' % (stat.traceback[0].filename,
+                                                stat.traceback[0].lineno),
+                            'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                           for stat in growth if stat.size_diff > 0][:self.top]
+        })
+        self._snapshot, self._collections = snapshot, collections
+        # snapshot bookkeeping must not be charged to next phase
+        self.mark(None)
+
+    def report(self):
+        """
+.. method:: report()
+
+        Return the report dictionary: 'label', 'python', 'scope', 'steps', 'window', 'phases'
+        (per phase totals and per step 'bytes_per_step' and 'blocks_per_step' averages) and
+        'windows'. 'scope' notes that numbers include every thread of the process.
+
+        """
+        phases = {}
+        for name, stats in self.phases.items():
+            phases[name] = dict(stats,
+                                bytes_per_step=stats['net_bytes'] / max(self.steps, 1),
+                                blocks_per_step=stats['net_blocks'] / max(self.steps, 1))
+        return {
+            'label': self.label,
+            'python': platform.python_version(),
+            'scope': 'process: allocations of every running thread are included',
+            'steps': self.steps,
+            'window': self.window,
+            'phases': phases,
+            'windows': self.windows
+        }
+
+    def dump(self, path):
+        """
+.. method:: dump(path)
+
+        Write the report as a JSON file to :samp:`path`.
+
+        """
+        with open(path, 'w') as fout:
+            json.dump(self.report(), fout, indent=2)
+
+
+def compare(old, new):
+    """
+.. function:: compare(old, new)
+
+    Compare two reports (dictionaries or JSON file paths) and return, for every phase of
+    either, the change of 'bytes_per_step', 'blocks_per_step' and 'peak_bytes' (new minus
+    old, missing phases counting as zero), plus the change of retained growth per step.
+
+    """
+    reports = []
+    for report in (old, new):
+        if isinstance(report, str):
+            with open(report) as fin:
+                report = json.load(fin)
+        reports.append(report)
+
+    keys = ['bytes_per_step', 'blocks_per_step', 'peak_bytes']
+    diff = {}
+    for name in sorted(set(reports[0]['phases']) | set(reports[1]['phases'])):
+        values = [r['phases'].get(name, {}) for r in reports]
+        diff[name] = {k: values[1].get(k, 0) - values[0].get(k, 0) for k in keys}
+
+    growth = [sum(w['growth_bytes'] for w in r['windows']) / max(r['steps'], 1)
+              for r in reports]
+    return {'phases': diff, 'growth_bytes_per_step': growth[1] - growth[0]}
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 18:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 18:40:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: batch_engine
+
+************
+Batch Engine
+************
+
+Vectorized engine stepping many engagements at once: every Missile/Target state variable is a
+NumPy array with one element per scenario, and every step of Player.update_nav and of png
+guidance laws is replicated with array operations.
+
+Results have the same format as runner.run_scenario ones, so the engine can replace
+runner.run_sweep wherever a batch of scenarios is evaluated (envelope.map_envelope does so by
+default for supported scenarios)::
+
+    results = run_batch([runner.make_scenario(t0={'vel': v}) for v in range(40)])
+
+Only png.ppn and png.apng guidance laws with PerfectSensors are supported.
+
+    """
+
+import numpy as np
+
+import runner
+
+_GUIDANCES = {'ppn': 0., 'apng': 1.}
+
+
+def supports(scenario):
+    """
+.. function:: supports(scenario)
+
+    Return whether :samp:`scenario` can be run by the batch engine (its guidance is png.ppn or
+    png.apng).
+
+    """
+    guidance = scenario.get('m0', {}).get('guidance', runner.DEFAULT_SCENARIO['m0']['guidance'])
+    return getattr(guidance, '__name__', guidance) in _GUIDANCES
+
+
+class BatchEngagement:
+    """
+=========================
+The BatchEngagement class
+=========================
+
+.. class:: BatchEngagement(scenarios, gains=None, schedule_times=None, dtype=np.float64)
+
+    Create a BatchEngagement instance holding Missile and Target states of every scenario in
+    :samp:`scenarios` list.
+    Guidance gains are taken from scenarios unless :samp:`gains` is given, either as a (N,)
+    array or as a (N, K) gain schedule: in this case gain k is used from
+    :samp:`schedule_times` [k-1] (K-1 increasing times) until schedule_times[k].
+    State, guidance memory and per scenario parameters are stored with :samp:`dtype`
+    precision: np.float32 halves memory traffic of large batches at the cost of accuracy (see
+    precision_report).
+
+    """
+    def __init__(self, scenarios, gains=None, schedule_times=None, dtype=np.float64):
+        scenarios = [runner.make_scenario(s.get('m0'), s.get('t0'),
+                                          **{k: v for k, v in s.items() if k not in ('m0', 't0')})
+                     for s in scenarios]
+        col = lambda fn: np.array([fn(s) for s in scenarios], dtype=np.float64)
+        self.dtype = dtype = np.dtype(dtype)
+
+        for s in scenarios:
+            if not supports(s):
+                raise ValueError('unsupported guidance for batch engine: %s' % s['m0']['guidance'])
+
+        self.n = len(scenarios)
+        self.max_steps = np.round(col(lambda s: s['max_time'] / s['dt'])).astype(np.int64)
+        self.dt = col(lambda s: s['dt']).astype(dtype)
+        self.tol = col(lambda s: s['tol']).astype(dtype)
+        self.escape = col(lambda s: s['escape']).astype(dtype)
+        self.apng = col(lambda s: _GUIDANCES[getattr(s['m0']['guidance'], '__name__',
+                                                     s['m0']['guidance'])]).astype(dtype)
+
+        if gains is None:
+            gains = col(lambda s: s['m0']['guidance_gain'])
+        self.gains = np.asarray(gains, dtype=dtype)
+        self.schedule_times = (None if schedule_times is None
+                               else np.asarray(schedule_times, dtype=np.float64))
+
+        mx, my = col(lambda s: s['m0']['pos'][0]), col(lambda s: s['m0']['pos'][1])
+        tx, ty = col(lambda s: s['t0']['pos'][0]), col(lambda s: s['t0']['pos'][1])
+        losangle0 = np.arctan2(ty - my, tx - mx)
+        mori = losangle0 + np.radians(col(lambda s: s['m0']['he']))
+        mvel, tvel = col(lambda s: s['m0']['vel']), col(lambda s: s['t0']['vel'])
+
+        # state rows: x, y, vx, vy, ori, acc
+        self.missile = np.array([mx, my, mvel * np.cos(mori), mvel * np.sin(mori), mori,
+                                 np.zeros(self.n)], dtype=dtype)
+        self.target = np.array([tx, ty, tvel * np.cos(losangle0), tvel * np.sin(losangle0),
+                                losangle0, col(lambda s: s['t0']['acc'])], dtype=dtype)
+
+        # guidance memory, nan until first assigned (attributes not yet set on a Missile)
+        self.los_angle = np.full(self.n, np.nan, dtype=dtype)
+        self.prev_range = np.full(self.n, np.nan, dtype=dtype)
+        self.prev_los_angle = np.full(self.n, np.nan, dtype=dtype)
+        self.closing_velocity = np.full(self.n, np.nan, dtype=dtype)
+        self.los_rate = np.full(self.n, np.nan, dtype=dtype)
+
+        self.steps = np.zeros(self.n, dtype=np.int64)
+        self.active = self.max_steps > 0
+
+    def gain(self):
+        """
+.. method:: gain()
+
+        Return current guidance gain of every engagement.
+
+        """
+        if self.gains.ndim == 1:
+            return self.gains
+        k = np.searchsorted(self.schedule_times, self.time(), side='right')
+        return self.gains[np.arange(self.n), k]
+
+    def time(self):
+        """
+.. method:: time()
+
+        Return current simulated time of every engagement.
+
+        """
+        return (self.steps * self.dt).astype(self.dtype)
+
+    def range(self):
+        """
+.. method:: range()
+
+        Return current Missile/Target distances.
+
+        """
+        return np.hypot(self.target[0] - self.missile[0], self.target[1] - self.missile[1])
+
+    def _guidance(self, act):
+        # png.ppn / png.apng
+        m, t, dt = self.missile, self.target, self.dt
+        dx, dy = t[0] - m[0], t[1] - m[1]
+        rng = np.sqrt(dy**2 + dx**2)
+        self.los_angle = np.where(act & (np.abs(dx) > 0.01), np.arctan2(dy, dx), self.los_angle)
+
+        known = act & ~np.isnan(self.prev_range)
+        self.closing_velocity = np.where(known, -(rng - self.prev_range) / dt,
+                                         self.closing_velocity)
+        self.los_rate = np.where(known, (self.los_angle - self.prev_los_angle) / dt,
+                                 self.los_rate)
+        cos = np.cos(m[4] - self.los_angle)
+        N = self.gain() / cos
+        acc = N * self.closing_velocity * self.los_rate + self.apng * (N / 2) * t[5]
+        m[5] = np.where(known & (np.abs(cos) > 0.01), acc, m[5])
+
+        self.prev_range = np.where(act, rng, self.prev_range)
+        self.prev_los_angle = np.where(act, self.los_angle, self.prev_los_angle)
+
+    @staticmethod
+    def _update_nav(p, act, dt):
+        # players.Player.update_nav
+        p[0] = np.where(act, p[0] + p[2] * dt, p[0])
+        p[1] = np.where(act, p[1] + p[3] * dt, p[1])
+        turn = act & (p[5] != 0)
+        ori = p[4] + (p[5] / np.sqrt(p[2]**2 + p[3]**2)) * dt
+        ori = np.where(ori < 0, np.pi * 2 - ori, ori)
+        while np.any(ori > np.pi * 2):
+            ori = np.where(ori > np.pi * 2, ori - np.pi * 2, ori)
+        p[4] = np.where(turn, ori, p[4])
+        vel_inc = p[5] * dt
+        p[2] = np.where(turn, p[2] + vel_inc * np.cos(p[4] + np.pi / 2), p[2])
+        p[3] = np.where(turn, p[3] + vel_inc * np.sin(p[4] + np.pi / 2), p[3])
+
+    def step(self):
+        """
+.. method:: step()
+
+        Step every active engagement by its dt.
+
+        """
+        act = self.active
+        with np.errstate(all='ignore'):
+            self._guidance(act)
+            self._update_nav(self.missile, act, self.dt)
+            self._update_nav(self.target, act, self.dt)
+        self.steps += act
+
+    def collided(self):
+        """
+.. method:: collided()
+
+        Return Missile/Target collision under allowed tolerance condition.
+
+        """
+        return ((np.abs(self.missile[0] - self.target[0]) < self.tol) &
+                (np.abs(self.missile[1] - self.target[1]) < self.tol))
+
+
+def run_batch(scenarios, gains=None, schedule_times=None, trajectory=False, dtype=np.float64):
+    """
+.. function:: run_batch(scenarios, gains=None, schedule_times=None, trajectory=False, dtype=np.float64)
+
+    Run :samp:`scenarios` list as a single vectorized batch and return the list of their
+    results, with the same format of runner.run_scenario ones.
+    :samp:`gains` and :samp:`schedule_times` override scenarios guidance gains, state and
+    trajectory buffers use :samp:`dtype` precision (see BatchEngagement); summary
+    accumulators are kept in float64.
+
+    """
+    eng = BatchEngagement(scenarios, gains, schedule_times, dtype)
+    n = eng.n
+    hit = np.zeros(n, dtype=bool)
+    min_range = eng.range()
+    peak_acc = np.zeros(n)
+    integrated_acc = np.zeros(n)
+    log = [] if trajectory else None
+
+    while np.any(eng.active):
+        act = eng.active.copy()
+        eng.step()
+
+        acc = np.abs(eng.missile[5])
+        peak_acc = np.where(act, np.maximum(peak_acc, acc), peak_acc)
+        integrated_acc = np.where(act, integrated_acc + acc * eng.dt, integrated_acc)
+        rng = eng.range()
+        min_range = np.where(act, np.minimum(min_range, rng), min_range)
+        if log is not None:
+            log.append(np.stack([eng.time(), eng.missile[0], eng.missile[1],
+                                 eng.target[0], eng.target[1], eng.missile[5]], axis=1))
+
+        hit |= act & eng.collided()
+        eng.active = act & ~hit & ~(rng > min_range + eng.escape) & (eng.steps < eng.max_steps)
+
+    results = []
+    for i in range(n):
+        result = {
+            'hit': bool(hit[i]),
+            'miss_distance': float(min_range[i]),
+            'time_of_flight': float(eng.steps[i] * eng.dt[i]),
+            'peak_acc': float(peak_acc[i]),
+            'integrated_acc': float(integrated_acc[i]),
+            'steps': int(eng.steps[i])
+        }
+        if log is not None:
+            rows = np.array([step[i] for step in log[:eng.steps[i]]]).reshape(-1, 6)
+            result['trajectory'] = {
+                't': rows[:, 0],
+                'missile': rows[:, 1:3],
+                'target': rows[:, 3:5],
+                'acc': rows[:, 5]
+            }
+        results.append(result)
+    return results
+
+
+def precision_report(classes, dtype=np.float32):
+    """
+.. function:: precision_report(classes, dtype=np.float32)
+
+    Run every scenario class of :samp:`classes` dictionary (class name -> scenarios list) with
+    float64 and :samp:`dtype` precision and return, per class, a dictionary with:
+
+        * :samp:`hit_agreement` fraction of scenarios with the same hit outcome;
+        * :samp:`miss_distance` and :samp:`time_of_flight` dictionaries of 'max_abs', 'mean_abs'
+          and 'max_rel' (relative to float64 value) errors.
+
+    """
+    report = {}
+    for name, scenarios in classes.items():
+        reference = run_batch(scenarios)
+        reduced = run_batch(scenarios, dtype=dtype)
+        entry = {'hit_agreement': float(np.mean([r['hit'] == c['hit']
+                                                 for r, c in zip(reference, reduced)]))}
+        for metric in ('miss_distance', 'time_of_flight'):
+            ref = np.array([r[metric] for r in reference])
+            err = np.abs(np.array([c[metric] for c in reduced]) - ref)
+            with np.errstate(all='ignore'):
+                rel = np.where(ref != 0, err / np.abs(ref), err)
+            entry[metric] = {'max_abs': float(err.max()), 'mean_abs': float(err.mean()),
+                             'max_rel': float(rel.max())}
+        report[name] = entry
+    return report
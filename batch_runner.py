@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 22:00:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 22:00:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: batch_runner
+
+************
+Batch Runner
+************
+
+Run scenario files of any size: scenario records are streamed from a JSONL or CSV file, run on
+a pool of worker processes with a bounded number of runs in flight, and result rows are
+appended to an output file (JSONL or CSV) as soon as they complete.
+
+Every record has an optional 'id' (its line number otherwise) and any of the following fields,
+overriding runner.DEFAULT_SCENARIO:
+
+    * 'm0' and 't0' configuration dictionaries (JSONL only);
+    * dotted scenario paths (see envelope.set_param), e.g. 'm0.pos.0', 't0.vel', 'dt';
+    * ALIASES short names, e.g. 'guidance', 'gain', 'm0_x', 't0_acc'.
+
+Records with any other field, or malformed JSONL lines, produce a row with an 'error' field.
+
+Ids of successful runs are appended to an index file: running again the same command resumes
+an interrupted batch, skipping them and retrying failed records::
+
+    python batch_runner.py scenarios.csv results.jsonl --processes 8
+
+    """
+
+import os
+import csv
+import json
+import argparse
+import concurrent.futures
+
+import runner
+import envelope
+
+ALIASES = {
+    'guidance': 'm0.guidance',
+    'gain': 'm0.guidance_gain',
+    'm0_x': 'm0.pos.0',
+    'm0_y': 'm0.pos.1',
+    'm0_vel': 'm0.vel',
+    'm0_he': 'm0.he',
+    't0_x': 't0.pos.0',
+    't0_y': 't0.pos.1',
+    't0_vel': 't0.vel',
+    't0_acc': 't0.acc'
+}
+
+RESULT_FIELDS = ['id', 'hit', 'miss_distance', 'time_of_flight', 'peak_acc', 'integrated_acc',
+                 'steps', 'error']
+
+
+class RecordError(ValueError):
+    """
+.. class:: RecordError(rid, message)
+
+    Error of a scenario record that cannot be run, :samp:`rid` being its id.
+
+    """
+    def __init__(self, rid, message):
+        ValueError.__init__(self, message)
+        self.id = rid
+
+
+def _number(value):
+    try:
+        return float(value) if any(c in value for c in '.eE') else int(value)
+    except ValueError:
+        return value
+
+
+def read_records(path):
+    """
+.. function:: read_records(path)
+
+    Generator yielding scenario records of :samp:`path` file, a CSV file if its extension is
+    .csv (numeric columns are converted, empty ones ignored) or a JSONL file.
+    A RecordError, whose id is the line number, is yielded in place of malformed lines.
+
+    """
+    with open(path, newline='') as fin:
+        if path.endswith('.csv'):
+            for line, row in enumerate(csv.DictReader(fin), 1):
+                record = {k: v if k == 'id' else _number(v)
+                          for k, v in row.items() if v not in (None, '')}
+                record.setdefault('id', line)
+                yield record
+        else:
+            for line, text in enumerate(fin, 1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as error:
+                    yield RecordError(line, 'malformed record: %s' % error)
+                    continue
+                if not isinstance(record, dict):
+                    yield RecordError(line, 'malformed record: not an object')
+                    continue
+                record.setdefault('id', line)
+                yield record
+
+
+def _valid_path(path):
+    # a dotted path must address an existing DEFAULT_SCENARIO entry
+    node = runner.DEFAULT_SCENARIO
+    for key in path.split('.'):
+        if isinstance(node, dict):
+            if key not in node:
+                return False
+            node = node[key]
+        elif isinstance(node, (list, tuple)):
+            if not key.isdigit() or int(key) >= len(node):
+                return False
+            node = node[int(key)]
+        else:
+            return False
+    return True
+
+
+def to_scenario(record):
+    """
+.. function:: to_scenario(record)
+
+    Return (id, scenario) tuple of :samp:`record` (ids are returned as strings).
+    Raise RecordError if a record field is neither an alias nor a scenario parameter.
+
+    """
+    rid = str(record['id'])
+    unknown = [key for key in record if key not in ('id', 'm0', 't0') and key not in ALIASES and
+               not _valid_path(key)]
+    for player in ('m0', 't0'):
+        unknown += ['%s.%s' % (player, key) for key in record.get(player) or {}
+                    if key not in runner.DEFAULT_SCENARIO[player]]
+    if unknown:
+        raise RecordError(rid, 'unknown record fields: %s' % ', '.join(sorted(unknown)))
+    scenario = runner.make_scenario(record.get('m0'), record.get('t0'))
+    for key, value in record.items():
+        if key not in ('id', 'm0', 't0'):
+            envelope.set_param(scenario, ALIASES.get(key, key), value)
+    return rid, scenario
+
+
+def completed_ids(index):
+    """
+.. function:: completed_ids(index)
+
+    Return the set of ids stored in :samp:`index` file (empty if it does not exist).
+
+    """
+    if not os.path.exists(index):
+        return set()
+    with open(index) as fin:
+        # a truncated last line belongs to an id whose row may be missing: run it again
+        return {line[:-1] for line in fin if line.endswith('\n')}
+
+
+class _ResultWriter:
+
+    def __init__(self, path):
+        self._csv = path.endswith('.csv')
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='')
+        if self._csv:
+            self._writer = csv.DictWriter(self._file, RESULT_FIELDS)
+            if new:
+                self._writer.writeheader()
+
+    def write(self, row):
+        if self._csv:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_file(source, output, index=None, processes=None, max_in_flight=None, cache=None,
+             progress_fn=None):
+    """
+.. function:: run_file(source, output, index=None, processes=None, max_in_flight=None, cache=None, progress_fn=None)
+
+    Run scenarios of :samp:`source` records file on :samp:`processes` worker processes, keeping
+    at most :samp:`max_in_flight` (default 4 per process) runs submitted, and append a row per
+    result to :samp:`output` file. Runs raising an exception, records with unknown fields and
+    malformed lines produce a row with an 'error' field.
+    Ids of successful rows are appended to :samp:`index` file (default :samp:`output` +
+    '.index'), records whose id is already there are skipped: failed records are run again,
+    appending a new row, by the next call. A results_cache.ResultCache may be passed as
+    :samp:`cache`. :samp:`progress_fn` is called with the id of every completed record.
+
+    Return the number of rows written.
+
+    """
+    index = output + '.index' if index is None else index
+    done_ids = completed_ids(index)
+    processes = processes or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * processes
+
+    writer = _ResultWriter(output)
+    written = 0
+
+    def store(rid, result=None, error=None):
+        nonlocal written
+        if error is None:
+            row = dict(result, id=rid)
+        else:
+            row = {'id': rid, 'error': repr(error)}
+        # row first: a crash in between runs the record again instead of losing it
+        writer.write(row)
+        if error is None:
+            with open(index, 'a') as fidx:
+                fidx.write(rid + '\n')
+        written += 1
+        if progress_fn is not None:
+            progress_fn(rid)
+
+    in_flight = {}
+
+    def drain(return_when):
+        done, _ = concurrent.futures.wait(in_flight, return_when=return_when)
+        for future in done:
+            rid, scenario = in_flight.pop(future)
+            try:
+                result = future.result()
+            except concurrent.futures.BrokenExecutor:
+                raise
+            except Exception as error:
+                store(rid, error=error)
+                continue
+            if cache is not None:
+                cache.put(scenario, result)
+            store(rid, result)
+
+    pool = concurrent.futures.ProcessPoolExecutor(processes)
+    try:
+        for record in read_records(source):
+            malformed = isinstance(record, RecordError)
+            rid = str(record.id if malformed else record.get('id'))
+            if rid in done_ids:
+                continue
+            done_ids.add(rid)
+            try:
+                if malformed:
+                    raise record
+                rid, scenario = to_scenario(record)
+            except (KeyError, IndexError, TypeError, ValueError) as error:
+                store(rid, error=error)
+                continue
+            cached = cache.get(scenario) if cache is not None else None
+            if cached is not None:
+                store(rid, cached)
+                continue
+            while len(in_flight) >= max_in_flight:
+                drain(concurrent.futures.FIRST_COMPLETED)
+            in_flight[pool.submit(runner.run_scenario, scenario)] = (rid, scenario)
+        drain(concurrent.futures.ALL_COMPLETED)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        writer.close()
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a scenarios file.')
+    parser.add_argument('source', help='JSONL or CSV file of scenario records')
+    parser.add_argument('output', help='JSONL or CSV results file (appended to)')
+    parser.add_argument('--index', dest='index', type=str, default=None,
+                        help='completed ids file (default: output + .index)')
+    parser.add_argument('--processes', dest='processes', type=int, default=None)
+    parser.add_argument('--inflight', dest='max_in_flight', type=int, default=None,
+                        help='maximum number of submitted runs')
+    parser.add_argument('--cache', dest='cache', type=str, default=None,
+                        help='results cache directory')
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache is not None:
+        import results_cache
+        cache = results_cache.ResultCache(args.cache)
+    count = run_file(args.source, args.output, args.index, args.processes, args.max_in_flight,
+                     cache, lambda rid: print('> done', rid))
+    print('> %d results written' % count)
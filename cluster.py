@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 17:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 17:40:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: cluster
+
+*******
+Cluster
+*******
+
+Run scenario sweeps on several hosts: a coordinator hands out chunks of scenarios (see runner
+module) through a multiprocessing manager, workers on any host run them headless and send back
+results summaries.
+
+Chunks leased by a worker which does not complete them in time (e.g. because it died) are
+handed out again, and completed chunks are appended to an optional journal file so that an
+interrupted sweep can be resumed.
+
+To run a sweep over a JSONL file of scenarios (one scenario dictionary per line)::
+
+    python cluster.py coordinator scenarios.jsonl journal.jsonl --host 0.0.0.0 --port 50000
+
+which prints the random authentication key to pass to every worker host::
+
+    python cluster.py worker coordinator_host:50000 --authkey <key> --processes 4
+
+The manager protocol unpickles whatever peers send: anybody knowing the key can run code on
+the coordinator (and a fake coordinator on workers), so the key must stay secret and the
+coordinator only listens on localhost unless a host is given.
+
+    """
+
+import os
+import sys
+import json
+import time
+import secrets
+import argparse
+import threading
+import multiprocessing
+from multiprocessing.managers import BaseManager
+
+import runner
+import results_cache
+
+
+class _DispatchManager(BaseManager):
+    pass
+
+
+class Dispatcher:
+    """
+====================
+The Dispatcher class
+====================
+
+.. class:: Dispatcher(scenarios, chunk_size, lease_timeout, max_retries=3, journal=None)
+
+    Create a Dispatcher instance splitting :samp:`scenarios` into chunks of :samp:`chunk_size`
+    scenarios.
+    A leased chunk not completed within :samp:`lease_timeout` seconds from the last worker
+    heartbeat is leased again, up to :samp:`max_retries` times.
+    If :samp:`journal` file path is given, chunks results already stored in it are not run
+    again and new ones are appended to it.
+    Dispatcher methods are called by workers through a manager proxy.
+
+    """
+    def __init__(self, scenarios, chunk_size, lease_timeout, max_retries=3, journal=None):
+        self._lock = threading.Lock()
+        self._lease_timeout = lease_timeout
+        self._max_retries = max_retries
+        self._journal = journal
+
+        self._keys = [results_cache.scenario_key(s) for s in scenarios]
+        self._results = {}
+        if journal is not None and os.path.exists(journal):
+            with open(journal) as fin:
+                for line in fin:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # truncated last line of an interrupted run
+                        continue
+                    self._results.update(zip(entry['keys'], entry['results']))
+
+        self._chunks = {}
+        self._pending = []
+        for cid, start in enumerate(range(0, len(scenarios), chunk_size)):
+            keys = self._keys[start:start + chunk_size]
+            if all(k in self._results for k in keys):
+                continue
+            self._chunks[cid] = (keys, scenarios[start:start + chunk_size])
+            self._pending.append(cid)
+        self._leases = {}
+        self._retries = {}
+        self._failed = {}
+        self.failed = []
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for cid, (_, expiry) in list(self._leases.items()):
+            if expiry < now:
+                del self._leases[cid]
+                self._retries[cid] = self._retries.get(cid, 0) + 1
+                if self._retries[cid] > self._max_retries:
+                    # kept aside: a late result from a slow worker is still accepted
+                    self._failed[cid] = self._chunks.pop(cid)
+                    self.failed.append(cid)
+                else:
+                    self._pending.append(cid)
+
+    def lease(self, worker):
+        """
+.. method:: lease(worker)
+
+        Return a dictionary with a 'status' key:
+
+            * 'work': a chunk is leased to :samp:`worker`, 'chunk' and 'scenarios' keys hold chunk
+              id and scenarios list;
+            * 'wait': every remaining chunk is leased, ask again later;
+            * 'done': there is nothing left to do.
+
+        """
+        with self._lock:
+            self._expire_leases()
+            if self._pending:
+                cid = self._pending.pop(0)
+                self._leases[cid] = (worker, time.monotonic() + self._lease_timeout)
+                return {'status': 'work', 'chunk': cid, 'scenarios': self._chunks[cid][1]}
+            return {'status': 'wait' if self._leases else 'done'}
+
+    def heartbeat(self, chunk):
+        """
+.. method:: heartbeat(chunk)
+
+        Extend :samp:`chunk` lease; return False if the lease is no more valid.
+
+        """
+        with self._lock:
+            # an expired lease may already be handed out again: it cannot be extended
+            self._expire_leases()
+            if chunk not in self._leases:
+                return False
+            worker = self._leases[chunk][0]
+            self._leases[chunk] = (worker, time.monotonic() + self._lease_timeout)
+            return True
+
+    def complete(self, chunk, results):
+        """
+.. method:: complete(chunk, results)
+
+        Store :samp:`chunk` :samp:`results`, also when the chunk was given up as failed.
+        Results for a chunk already completed (e.g. by a worker considered lost) are ignored.
+
+        """
+        with self._lock:
+            if chunk in self._failed:
+                keys = self._failed.pop(chunk)[0]
+                self.failed.remove(chunk)
+            elif chunk in self._chunks:
+                keys = self._chunks.pop(chunk)[0]
+            else:
+                return
+            self._leases.pop(chunk, None)
+            if chunk in self._pending:
+                self._pending.remove(chunk)
+            self._results.update(zip(keys, results))
+            if self._journal is not None:
+                with open(self._journal, 'a') as fout:
+                    fout.write(json.dumps({'chunk': chunk, 'keys': keys, 'results': results}) + '\n')
+
+    def progress(self):
+        """
+.. method:: progress()
+
+        Return (completed, total) scenarios count.
+
+        """
+        with self._lock:
+            return sum(k in self._results for k in self._keys), len(self._keys)
+
+    def finished(self):
+        """
+.. method:: finished()
+
+        Return True when no chunk is left to run.
+
+        """
+        with self._lock:
+            self._expire_leases()
+            return not self._chunks
+
+    def results(self):
+        """
+.. method:: results()
+
+        Return results list in scenarios order (None for scenarios of failed chunks).
+
+        """
+        with self._lock:
+            return [self._results.get(k) for k in self._keys]
+
+
+class Coordinator:
+    """
+=====================
+The Coordinator class
+=====================
+
+.. class:: Coordinator(scenarios, address=('127.0.0.1', 0), authkey=None, chunk_size=16, lease_timeout=60, max_retries=3, journal=None)
+
+    Create a Coordinator instance serving :samp:`scenarios` chunks (see Dispatcher) to workers
+    connecting to :samp:`address` with :samp:`authkey` (bytes). If no key is given a random
+    one is generated, available as the authkey attribute.
+    Port 0 picks a free port, actual address is available as the address attribute once
+    started.
+
+    """
+    def __init__(self, scenarios, address=('127.0.0.1', 0), authkey=None, chunk_size=16,
+                 lease_timeout=60, max_retries=3, journal=None):
+        self.dispatcher = Dispatcher(list(scenarios), chunk_size, lease_timeout, max_retries,
+                                     journal)
+        self.authkey = authkey if authkey is not None else secrets.token_hex(16).encode('ascii')
+        self._address = address
+        self._server = None
+        self.address = None
+
+    def start(self):
+        """
+.. method:: start()
+
+        Start serving chunks from a background thread and return serving address.
+
+        """
+        _DispatchManager.register('dispatcher', callable=lambda: self.dispatcher)
+        self._server = _DispatchManager(self._address, self.authkey).get_server()
+        self.address = self._server.address
+        threading.Thread(target=self._serve, args=(self._server,), daemon=True).start()
+        return self.address
+
+    @staticmethod
+    def _serve(server):
+        try:
+            server.serve_forever()
+        except SystemExit:
+            # serve_forever leaves through sys.exit once stopped
+            pass
+
+    def wait(self, poll=0.1, progress_fn=None):
+        """
+.. method:: wait(poll=0.1, progress_fn=None)
+
+        Block until every chunk is completed (or failed) and return results list in scenarios
+        order. :samp:`progress_fn` is called with (completed, total) counts every :samp:`poll`
+        seconds.
+
+        """
+        while not self.dispatcher.finished():
+            if progress_fn is not None:
+                progress_fn(*self.dispatcher.progress())
+            time.sleep(poll)
+        return self.dispatcher.results()
+
+    def shutdown(self):
+        """
+.. method:: shutdown()
+
+        Stop serving chunks.
+
+        """
+        if self._server is not None:
+            self._server.stop_event.set()
+            self._server.listener.close()
+            self._server = None
+
+
+def work(address, authkey, worker=None, processes=1, poll=0.5):
+    """
+.. function:: work(address, authkey, worker=None, processes=1, poll=0.5)
+
+    Connect to the Coordinator at :samp:`address` and run leased chunks, on
+    :samp:`processes` local processes, until the sweep is done or the coordinator is gone.
+    Return the number of completed chunks.
+
+    """
+    worker = worker or '%s:%d' % (os.uname().nodename, os.getpid())
+    _DispatchManager.register('dispatcher')
+    manager = _DispatchManager(tuple(address), authkey)
+    manager.connect()
+    dispatcher = manager.dispatcher()
+
+    pool = multiprocessing.Pool(processes) if processes != 1 else None
+    completed = 0
+    try:
+        while True:
+            task = dispatcher.lease(worker)
+            if task['status'] == 'done':
+                break
+            if task['status'] == 'wait':
+                time.sleep(poll)
+                continue
+            if pool is None:
+                done = map(runner.run_scenario, task['scenarios'])
+            else:
+                done = pool.imap(runner.run_scenario, task['scenarios'])
+            results = []
+            for result in done:
+                results.append(result)
+                dispatcher.heartbeat(task['chunk'])
+            dispatcher.complete(task['chunk'], results)
+            completed += 1
+    except (EOFError, ConnectionError):
+        # coordinator is gone
+        pass
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return completed
+
+
+def launch_local_workers(address, authkey, count=None):
+    """
+.. function:: launch_local_workers(address, authkey, count=None)
+
+    Start :samp:`count` worker processes (one per cpu if None) on the local host and return
+    them: useful to run a sweep on a single machine or to test a coordinator.
+
+    """
+    procs = []
+    for _ in range(count or multiprocessing.cpu_count()):
+        proc = multiprocessing.Process(target=work, args=(address, authkey), daemon=True)
+        proc.start()
+        procs.append(proc)
+    return procs
+
+
+def _host_port(value):
+    host, port = value.rsplit(':', 1)
+    return host, int(port)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Distributed scenarios sweep.')
+    auth = argparse.ArgumentParser(add_help=False)
+    auth.add_argument('--authkey', dest='authkey', type=str, default=None,
+                      help='shared authentication key (required by workers, generated by '
+                      'the coordinator if missing)')
+    sub = parser.add_subparsers(dest='role', required=True)
+
+    coord = sub.add_parser('coordinator', parents=[auth], help='serve scenarios to workers')
+    coord.add_argument('scenarios', help='JSONL file of scenarios')
+    coord.add_argument('journal', help='JSONL journal of completed chunks')
+    coord.add_argument('--host', dest='host', type=str, default='127.0.0.1',
+                       help='listening address (default: localhost only)')
+    coord.add_argument('--port', dest='port', type=int, default=50000)
+    coord.add_argument('--chunksize', dest='chunk_size', type=int, default=16)
+    coord.add_argument('--leasetimeout', dest='lease_timeout', type=float, default=60)
+    coord.add_argument('--localworkers', dest='local_workers', type=int, default=0,
+                       help='also run this number of workers on this host')
+
+    wrk = sub.add_parser('worker', parents=[auth], help='run scenarios served by a coordinator')
+    wrk.add_argument('address', type=_host_port, help='coordinator host:port')
+    wrk.add_argument('--processes', dest='processes', type=int, default=1)
+
+    args = parser.parse_args()
+
+    if args.role == 'worker':
+        if args.authkey is None:
+            parser.error('workers need the --authkey printed by the coordinator')
+        work(args.address, args.authkey.encode('utf-8'), processes=args.processes)
+        sys.exit(0)
+
+    with open(args.scenarios) as fin:
+        scenarios = [json.loads(line) for line in fin if line.strip()]
+    authkey = None if args.authkey is None else args.authkey.encode('utf-8')
+    coordinator = Coordinator(scenarios, (args.host, args.port), authkey, args.chunk_size,
+                              args.lease_timeout, journal=args.journal)
+    address = coordinator.start()
+    print('> serving on %s:%d, authkey: %s' % (address[0], address[1],
+                                              coordinator.authkey.decode('utf-8')))
+    if args.local_workers:
+        local_host = '127.0.0.1' if args.host in ('', '0.0.0.0') else args.host
+        launch_local_workers((local_host, address[1]), coordinator.authkey, args.local_workers)
+    coordinator.wait(1, lambda done, total: print('> %d/%d scenarios' % (done, total)))
+    coordinator.shutdown()
+    print('> failed chunks:', coordinator.dispatcher.failed)
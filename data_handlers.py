@@ -26,8 +26,19 @@ Handle useful simulation data: plot and keep history.
 
     """
 
+import time
+import zlib
+import weakref
+import tempfile
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
 import pyqtgraph as pg
-from pyqtgraph.Qt import QtGui
+from pyqtgraph.Qt import QtGui, QtCore
+
+import decimation
 
 class PlotterChannel(pg.QtCore.QObject):
     plot_event = pg.Qt.QtCore.pyqtSignal(dict)
@@ -38,9 +49,11 @@ class Plotter:
 The Plotter class
 =================
 
-.. class:: Plotter(title, size, update_fn=None)
+.. class:: Plotter(title, size, update_fn=None, lod=True)
 
         Creates a Plotter instance with window title :samp:`title` and window size :samp:`size`.
+        If :samp:`lod` is True, data passed to set_data is reduced to window width resolution
+        (see decimation.MinMaxDecimator).
 
         To update Plotter plots from a different thread than the one executing Qt Plotter app,
         :samp:`update_fn` function is needed.
@@ -62,11 +75,13 @@ The Plotter class
             my_plt = Plotter('nice_title', (400,400), my_update_fn)
             threading.Thread(target=update_from_diff_thread).start()
     """
-    def __init__(self, title, size, update_fn=None):
+    def __init__(self, title, size, update_fn=None, lod=True):
         self._win = pg.GraphicsWindow(title=title)
         self._win.resize(*size)
         self._plots = {}
         self._curves = {}
+        self._lod_columns = size[0] if lod else None
+        self._decimators = {}
         self._app_inst = QtGui.QApplication.instance()
 
         self.pc = PlotterChannel()
@@ -111,14 +126,28 @@ The Plotter class
         """
         return list(self._plots.keys())
 
-    def set_data(self, plot, data, curve_index=0):
+    def set_data(self, plot, data, curve_index=0, offset=0):
         """
-.. method:: set_data(plot, data, curve_index = 0)
+.. method:: set_data(plot, data, curve_index = 0, offset = 0)
 
-        Plot :samp:`data` list to curve :samp:`curve_index` inside plot :samp:`plot`.
+        Plot :samp:`data` list to curve :samp:`curve_index` inside plot :samp:`plot`, against
+        sample indices starting from :samp:`offset` (e.g. the index of the first sample still
+        held by a ring buffer).
+        With level of detail reduction enabled :samp:`data` is expected to be a growing series:
+        only samples added since previous call are processed.
 
         """
-        self._curves[plot][curve_index].setData(data)
+        if self._lod_columns is None:
+            data = np.asarray(data)
+            self._curves[plot][curve_index].setData(offset + np.arange(len(data)), data)
+            return
+        dec = self._decimators.get((plot, curve_index))
+        if dec is None or len(data) < dec.count:
+            dec = self._decimators[(plot, curve_index)] = \
+                decimation.MinMaxDecimator(self._lod_columns)
+        dec.extend(data[dec.count:])
+        x, y = dec.data()
+        self._curves[plot][curve_index].setData(offset + x, y)
 
     def run(self):
         """
@@ -139,13 +168,485 @@ The Plotter class
         self._app_inst.exit()
 
 
+class SpillingSeries:
+    """
+========================
+The SpillingSeries class
+========================
+
+.. class:: SpillingSeries(hot_size, spill_dir=None)
+
+        Create a SpillingSeries instance: a list-like series of samples (numbers or equal
+        length tuples of numbers) keeping at most 2 * :samp:`hot_size` most recent samples in
+        memory, older ones being spilled in :samp:`hot_size` long zlib compressed chunks to an
+        anonymous temporary file inside :samp:`spill_dir`.
+
+        It supports append, len, iteration, indexing, slicing (slices are returned as NumPy
+        arrays and only decompress the spilled chunks they cover) and conversion to a NumPy
+        array through np.asarray, so it can replace a history list transparently.
+        A lock serializes spills and reads, so other threads (e.g. a Plotter) can read the
+        series while the simulator appends to it.
+
+    """
+    def __init__(self, hot_size, spill_dir=None):
+        self._hot_size = hot_size
+        self._spill_dir = spill_dir
+        self._hot = []
+        self._file = None
+        self._chunks = []
+        self._cold = 0
+        self._cached = (None, None)
+        self._shape = None
+        self._lock = threading.RLock()
+
+    def append(self, sample):
+        """
+.. method:: append(sample)
+
+        Append :samp:`sample` to the series.
+
+        """
+        with self._lock:
+            if self._shape is None:
+                self._shape = np.shape(sample)
+            self._hot.append(sample)
+            if len(self._hot) >= 2 * self._hot_size:
+                self._spill()
+
+    def write(self, *parts):
+        """
+.. method:: write(*parts)
+
+        Append a sample made of :samp:`parts` numbers or arrays (see SeriesBuffer.write).
+
+        """
+        sample = np.hstack(parts).tolist()
+        self.append(sample[0] if len(sample) == 1 else tuple(sample))
+
+    def _spill(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self._spill_dir)
+        chunk = np.asarray(self._hot[:self._hot_size], dtype=np.float64)
+        data = zlib.compress(chunk.tobytes(), 1)
+        self._file.seek(0, 2)
+        self._chunks.append((self._file.tell(), len(data), chunk.shape))
+        self._file.write(data)
+        self._hot = self._hot[self._hot_size:]
+        self._cold += len(chunk)
+
+    def _chunk(self, index):
+        if self._cached[0] != index:
+            offset, size, shape = self._chunks[index]
+            self._file.seek(offset)
+            data = zlib.decompress(self._file.read(size))
+            self._cached = (index, np.frombuffer(data, dtype=np.float64).reshape(shape))
+        return self._cached[1]
+
+    def __len__(self):
+        with self._lock:
+            return self._cold + len(self._hot)
+
+    def __iter__(self):
+        # samples appended meanwhile are not iterated, spills are
+        count = len(self)
+        for start in range(0, count, self._hot_size):
+            for sample in self._slice(start, min(start + self._hot_size, count)).tolist():
+                yield tuple(sample) if isinstance(sample, list) else sample
+
+    def _slice(self, start, stop):
+        # read only the spilled chunks covering [start, stop)
+        with self._lock:
+            parts = []
+            for index in range(start // self._hot_size, len(self._chunks)):
+                first = index * self._hot_size
+                if first >= min(stop, self._cold):
+                    break
+                parts.append(self._chunk(index)[max(start - first, 0):stop - first])
+            hot = self._hot[max(start - self._cold, 0):max(stop - self._cold, 0)]
+        shape = self._shape if self._shape is not None else ()
+        parts.append(np.asarray(hot, dtype=np.float64).reshape((len(hot),) + shape))
+        return np.concatenate(parts)
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                start, stop, step = index.indices(len(self))
+                if step < 0:
+                    return np.asarray(self)[index]
+                return self._slice(start, max(start, stop))[::step]
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('series index out of range')
+            if index >= self._cold:
+                return self._hot[index - self._cold]
+            sample = self._chunk(index // self._hot_size)[index % self._hot_size].tolist()
+        return tuple(sample) if isinstance(sample, list) else sample
+
+    def __array__(self, dtype=None, copy=None):
+        return self._slice(0, len(self)).astype(dtype or np.float64, copy=False)
+
+    def close(self):
+        """
+.. method:: close()
+
+        Release spilled samples file.
+
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class SharedRing:
+    """
+====================
+The SharedRing class
+====================
+
+.. class:: SharedRing(ids, capacity)
+
+        Create a SharedRing instance: for every id in :samp:`ids` a ring buffer of the
+        :samp:`capacity` most recent samples (numbers), allocated in shared memory so that a
+        plotter process can read what the simulator writes without sharing its GIL.
+
+        Writes are framed by a sequence counter (odd while a write is in progress): readers copy
+        the buffers and retry if the counter changed meanwhile, so they always get a consistent
+        snapshot and the writer never waits.
+
+        The emit method has the same signature of Plotter.pc.plot_event one, so a SharedRing can
+        replace it as Simulator :samp:`plt_event` (see start_plotter_process).
+
+    """
+    def __init__(self, ids, capacity, _name=None):
+        self.ids = list(ids)
+        self.capacity = capacity
+        n = len(self.ids)
+        # header: sequence counter, quit flag, per id samples count
+        header = 2 + n
+        self._shm = shared_memory.SharedMemory(name=_name, create=_name is None,
+                                               size=8 * (header + n * capacity))
+        self._header = np.ndarray((header,), np.int64, buffer=self._shm.buf)
+        self._data = np.ndarray((n, capacity), np.float64, buffer=self._shm.buf, offset=8 * header)
+        self._finalizer = weakref.finalize(self, self._release, self._shm, _name is None)
+
+    @staticmethod
+    def _release(shm, unlink):
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+    def spec(self):
+        """
+.. method:: spec()
+
+        Return the picklable description needed to attach to the SharedRing from another
+        process (see attach()).
+
+        """
+        return {'ids': self.ids, 'capacity': self.capacity, 'name': self._shm.name}
+
+    @classmethod
+    def attach(cls, spec):
+        """
+.. method:: attach(spec)
+
+        Return a SharedRing instance attached to the shared memory described by :samp:`spec`.
+
+        """
+        return cls(spec['ids'], spec['capacity'], spec['name'])
+
+    def emit(self, history):
+        """
+.. method:: emit(history)
+
+        Write samples appended to :samp:`history` series (a dictionary with a key for every
+        SharedRing id) since previous call, then bump the sequence counter.
+        A dictionary with a 'quit' key asks readers to quit instead.
+
+        """
+        if 'quit' in history:
+            self._header[1] = 1
+            return
+        counts = self._header[2:]
+        self._header[0] += 1
+        for i, mid in enumerate(self.ids):
+            series = history[mid]
+            for value in series[int(counts[i]):]:
+                self._data[i, counts[i] % self.capacity] = value
+                counts[i] += 1
+        self._header[0] += 1
+
+    def quit_requested(self):
+        """
+.. method:: quit_requested()
+
+        Return whether the writer asked readers to quit.
+
+        """
+        return bool(self._header[1])
+
+    def read(self, offsets=False):
+        """
+.. method:: read(offsets=False)
+
+        Return a consistent snapshot of the SharedRing: a dictionary with a NumPy array of the
+        most recent samples (oldest first) for every id.
+        If :samp:`offsets` is True return a (snapshot, offsets) tuple, offsets being a
+        dictionary with the absolute index of the first returned sample for every id.
+
+        """
+        while True:
+            seq = int(self._header[0])
+            if seq % 2:
+                time.sleep(0)
+                continue
+            counts = self._header[2:].copy()
+            data = self._data.copy()
+            if int(self._header[0]) == seq:
+                break
+        snapshot, starts = {}, {}
+        for i, mid in enumerate(self.ids):
+            if counts[i] <= self.capacity:
+                snapshot[mid] = data[i, :counts[i]]
+            else:
+                snapshot[mid] = np.roll(data[i], -int(counts[i] % self.capacity))
+            starts[mid] = max(int(counts[i]) - self.capacity, 0)
+        return (snapshot, starts) if offsets else snapshot
+
+    def close(self):
+        """
+.. method:: close()
+
+        Release shared memory (it is unlinked by the SharedRing which created it).
+
+        """
+        self._header = self._data = None
+        self._finalizer()
+
+
+def _plotter_main(spec, title, size, plots_list, interval):
+    ring = SharedRing.attach(spec)
+    plt = Plotter(title, size, lod=False)
+    plt.add_plots(plots_list)
+
+    def poll():
+        if ring.quit_requested():
+            plt.quit()
+            return
+        snapshot, offsets = ring.read(offsets=True)
+        for plt_id in plt.plots():
+            plt.set_data(plt_id, snapshot[plt_id], offset=offsets[plt_id])
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(poll)
+    timer.start(interval)
+    plt.run()
+    ring.close()
+
+
+def start_plotter_process(ring, title, size, plots_list, interval=30):
+    """
+.. function:: start_plotter_process(ring, title, size, plots_list, interval=30)
+
+    Start and return a process running a Plotter with window title :samp:`title`, window size
+    :samp:`size` and :samp:`plots_list` plots (see Plotter.add_plots), redrawn every
+    :samp:`interval` milliseconds from :samp:`ring` SharedRing contents (every plot id must
+    be a SharedRing id): plots show the ring capacity most recent samples, at their absolute
+    sample indices. The process quits when ring emit is called with a 'quit' key.
+
+    """
+    proc = multiprocessing.Process(target=_plotter_main,
+                                   args=(ring.spec(), title, size, plots_list, interval),
+                                   daemon=True)
+    proc.start()
+    return proc
+
+
+class SeriesBuffer:
+    """
+======================
+The SeriesBuffer class
+======================
+
+.. class:: SeriesBuffer(width=1, capacity=1024)
+
+        Create a SeriesBuffer instance: a list-like series of samples made of :samp:`width`
+        numbers, stored in a preallocated float64 array of :samp:`capacity` rows (doubled when
+        full), so that writing a sample does not allocate any object.
+
+        Indexing returns a number for 1 wide series, a row array otherwise; slices and
+        np.asarray return array views.
+
+    """
+    def __init__(self, width=1, capacity=1024):
+        self.width = width
+        self._data = np.empty((capacity, width))
+        self._len = 0
+
+    def write(self, *parts):
+        """
+.. method:: write(*parts)
+
+        Append a sample made of :samp:`parts`, numbers or arrays whose sizes add up to width.
+
+        """
+        if self._len == len(self._data):
+            self._data = np.concatenate([self._data, np.empty_like(self._data)])
+        row = self._data[self._len]
+        col = 0
+        for part in parts:
+            size = np.size(part)
+            row[col:col + size] = part
+            col += size
+        self._len += 1
+
+    def append(self, sample):
+        """
+.. method:: append(sample)
+
+        Append :samp:`sample` (a number or a sequence of width numbers).
+
+        """
+        self.write(sample)
+
+    def _view(self):
+        data = self._data[:self._len]
+        return data[:, 0] if self.width == 1 else data
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return iter(self._view().tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._view()[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('series index out of range')
+        return self._view()[index]
+
+    def __array__(self, dtype=None, copy=None):
+        return self._view().astype(dtype or np.float64, copy=bool(copy))
+
+
+class Timeline:
+    """
+==================
+The Timeline class
+==================
+
+.. class:: Timeline(interval, width)
+
+        Create a Timeline instance keeping a keyframe every :samp:`interval` steps, a sample of
+        :samp:`width` numbers (e.g. Players state arrays and history lengths) from which the
+        simulation can be replayed forward.
+
+    """
+    def __init__(self, interval, width):
+        self.interval = interval
+        self._frames = SeriesBuffer(width)
+
+    def store(self, step, *parts):
+        """
+.. method:: store(step, *parts)
+
+        Store :samp:`parts` (see SeriesBuffer.write) as :samp:`step` keyframe if step is a
+        multiple of interval not stored yet.
+
+        """
+        if step % self.interval == 0 and step // self.interval == len(self._frames):
+            self._frames.write(*parts)
+
+    def keyframe(self, step):
+        """
+.. method:: keyframe(step)
+
+        Return (keyframe step, keyframe) tuple of the nearest keyframe preceding :samp:`step`.
+
+        """
+        index = min(step // self.interval, len(self._frames) - 1)
+        return index * self.interval, self._frames[index]
+
+
+class LogPolicy:
+    """
+===================
+The LogPolicy class
+===================
+
+.. class:: LogPolicy(kind='every', value=1)
+
+        Create a LogPolicy instance deciding which samples of a history series are stored:
+
+            * :samp:`kind` 'every': every :samp:`value`-th step;
+            * :samp:`kind` 'change': when a sample differs from the last stored one by more than
+              :samp:`value` (largest absolute difference of its numbers);
+            * :samp:`kind` 'events': at steps where one of :samp:`value` events (a subset of
+              EVENTS) happens;
+            * :samp:`kind` 'off': never.
+
+        Unknown kinds or events, :samp:`value` below 1 for 'every' and negative :samp:`value`
+        for 'change' raise ValueError.
+
+        Example::
+
+            policies = {'acc': LogPolicy('change', 0.5), 'los': LogPolicy('every', 20),
+                        'los_rate': LogPolicy('events', ('launch', 'cpa', 'intercept'))}
+
+    """
+    KINDS = ('every', 'change', 'events', 'off')
+    EVENTS = ('launch', 'max_g', 'cpa', 'intercept')
+
+    def __init__(self, kind='every', value=1):
+        if kind not in self.KINDS:
+            raise ValueError('unknown log policy: %s' % kind)
+        if kind == 'events' and not set(value) <= set(self.EVENTS):
+            raise ValueError('unknown log events: %s' % (set(value) - set(self.EVENTS)))
+        if kind == 'every' and not (value >= 1 and value == int(value)):
+            raise ValueError('every log policy needs a positive integer, got %s' % value)
+        if kind == 'change' and not value >= 0:
+            raise ValueError('change log policy needs a non negative threshold, got %s' % value)
+        self.kind = kind
+        self.value = frozenset(value) if kind == 'events' else value
+
+    def accept(self, step, events, series, *parts):
+        """
+.. method:: accept(step, events, series, *parts)
+
+        Return whether sample :samp:`parts` of :samp:`step` should be written to
+        :samp:`series`, :samp:`events` being the set of events happened at this step.
+
+        """
+        if self.kind == 'every':
+            return step % self.value == 0
+        if self.kind == 'change':
+            if not len(series):
+                return True
+            return np.max(np.abs(np.hstack(parts) - series[-1])) > self.value
+        if self.kind == 'events':
+            return not self.value.isdisjoint(events)
+        return False
+
+
 history = None
-def make_history(ids):
+def make_history(ids, hot_size=None, spill_dir=None, widths=None):
     """
-.. function:: make_history(ids)
+.. function:: make_history(ids, hot_size=None, spill_dir=None, widths=None)
 
-    Prepare a history dictionary with ids as keys and empty lists as values to keep data logs.
+    Prepare a history dictionary with ids as keys and empty SeriesBuffer as values to keep data
+    logs (:samp:`widths` dictionary gives the number of values of multi valued samples).
+    If :samp:`hot_size` is given, SpillingSeries are used instead, so that history memory stays
+    bounded on long runs (spilled samples are stored inside :samp:`spill_dir`).
 
     """
     global history
-    history = {mid: [] for mid in ids}
+    widths = widths or {}
+    if hot_size is None:
+        history = {mid: SeriesBuffer(widths.get(mid, 1)) for mid in ids}
+    else:
+        history = {mid: SpillingSeries(hot_size, spill_dir) for mid in ids}
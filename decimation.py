@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 20:30:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 20:30:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: decimation
+
+**********
+Decimation
+**********
+
+Level of detail reduction of plot series and screen trails, so that drawing cost is bounded
+by screen resolution (or a fixed number of trail items) instead of simulation length.
+
+    """
+
+import numpy as np
+
+
+class MinMaxDecimator:
+    """
+=========================
+The MinMaxDecimator class
+=========================
+
+.. class:: MinMaxDecimator(columns)
+
+        Create a MinMaxDecimator instance reducing a growing series to at most 2 *
+        :samp:`columns` buckets, keeping minimum and maximum samples of every bucket: plotted
+        on a :samp:`columns` pixels wide plot it looks like the full series (within a pixel).
+        Samples are added incrementally; when buckets exceed the limit, adjacent pairs are
+        merged and bucket size doubles.
+
+    """
+    def __init__(self, columns):
+        self.columns = max(int(columns), 1)
+        self.bucket = 1
+        self.count = 0
+        self._lo_i = self._hi_i = np.empty(0, dtype=np.int64)
+        self._lo_v = self._hi_v = np.empty(0)
+        self._pending = np.empty(0)
+
+    def extend(self, values):
+        """
+.. method:: extend(values)
+
+        Add :samp:`values` samples.
+
+        """
+        values = np.concatenate([self._pending, np.asarray(values, dtype=np.float64)])
+        start = self.count - len(self._pending)
+        full = len(values) // self.bucket * self.bucket
+        self._add_buckets(start, values[:full].reshape(-1, self.bucket))
+        self._pending = values[full:]
+        self.count = start + len(values)
+
+        while len(self._lo_v) > 2 * self.columns:
+            self._merge_pairs()
+
+    def _add_buckets(self, start, blocks):
+        if not len(blocks):
+            return
+        offsets = start + np.arange(len(blocks)) * self.bucket
+        lo, hi = np.argmin(blocks, axis=1), np.argmax(blocks, axis=1)
+        rows = np.arange(len(blocks))
+        self._lo_i = np.concatenate([self._lo_i, offsets + lo])
+        self._lo_v = np.concatenate([self._lo_v, blocks[rows, lo]])
+        self._hi_i = np.concatenate([self._hi_i, offsets + hi])
+        self._hi_v = np.concatenate([self._hi_v, blocks[rows, hi]])
+
+    def _merge_pairs(self):
+        # with an odd count the last bucket is left alone, to be merged with next ones
+        even = len(self._lo_v) // 2 * 2
+        tail = slice(even, None)
+        lo_i, lo_v = self._lo_i[:even].reshape(-1, 2), self._lo_v[:even].reshape(-1, 2)
+        hi_i, hi_v = self._hi_i[:even].reshape(-1, 2), self._hi_v[:even].reshape(-1, 2)
+        rows = np.arange(len(lo_v))
+        lo, hi = np.argmin(lo_v, axis=1), np.argmax(hi_v, axis=1)
+        self._lo_i = np.concatenate([lo_i[rows, lo], self._lo_i[tail]])
+        self._lo_v = np.concatenate([lo_v[rows, lo], self._lo_v[tail]])
+        self._hi_i = np.concatenate([hi_i[rows, hi], self._hi_i[tail]])
+        self._hi_v = np.concatenate([hi_v[rows, hi], self._hi_v[tail]])
+        self.bucket *= 2
+
+    def data(self):
+        """
+.. method:: data()
+
+        Return (x, y) arrays of decimated series, x being samples indices.
+
+        """
+        first = self._lo_i <= self._hi_i
+        x = np.empty(2 * len(self._lo_i), dtype=np.int64)
+        y = np.empty(2 * len(self._lo_i))
+        x[0::2] = np.where(first, self._lo_i, self._hi_i)
+        x[1::2] = np.where(first, self._hi_i, self._lo_i)
+        y[0::2] = np.where(first, self._lo_v, self._hi_v)
+        y[1::2] = np.where(first, self._hi_v, self._lo_v)
+        start = self.count - len(self._pending)
+        return (np.concatenate([x, start + np.arange(len(self._pending))]),
+                np.concatenate([y, self._pending]))
+
+
+class TrailDecimator:
+    """
+========================
+The TrailDecimator class
+========================
+
+.. class:: TrailDecimator(max_items)
+
+        Create a TrailDecimator instance reducing a growing series of trail items (e.g. line of
+        sight segments, rows of 4 coordinates) to at most :samp:`max_items` items, so that
+        drawing the whole trail costs the same at any run length.
+        Items are added incrementally and kept with a stride, doubled (dropping every other
+        kept item) whenever the limit is exceeded; the last added item is always kept.
+
+    """
+    def __init__(self, max_items):
+        self.max_items = max(int(max_items), 2)
+        self.stride = 1
+        self.count = 0
+        self._index = np.empty(0, dtype=np.int64)
+        self._items = None
+        self._last = None
+
+    def extend(self, items):
+        """
+.. method:: extend(items)
+
+        Add :samp:`items` (an array of shape (n, width)) and return the ones kept, to be drawn
+        incrementally.
+
+        """
+        items = np.asarray(items, dtype=np.float64)
+        if not len(items):
+            return items
+        if self._items is None:
+            self._items = np.empty((0,) + items.shape[1:])
+        index = self.count + np.arange(len(items))
+        keep = index % self.stride == 0
+        self._index = np.concatenate([self._index, index[keep]])
+        self._items = np.concatenate([self._items, items[keep]])
+        self.count += len(items)
+        self._last = (index[-1], items[-1])
+
+        while len(self._index) > self.max_items:
+            self.stride *= 2
+            coarse = self._index % self.stride == 0
+            self._index, self._items = self._index[coarse], self._items[coarse]
+        return items[keep & (index % self.stride == 0)]
+
+    def data(self, stop=None):
+        """
+.. method:: data(stop=None)
+
+        Return kept items (added before :samp:`stop` index, if given) followed by the last
+        added one, if it was not kept.
+
+        """
+        if self._items is None:
+            return np.empty((0, 0))
+        stop = self.count if stop is None else min(stop, self.count)
+        n = np.searchsorted(self._index, stop)
+        items = self._items[:n]
+        if stop == self.count and (not n or self._index[n - 1] != self._last[0]):
+            items = np.concatenate([items, self._last[1][None]])
+        return items
+
+
+def distinct_pixels(*pixels):
+    """
+.. function:: distinct_pixels(*pixels)
+
+    Given one or more integer pixel coordinates arrays of shape (n, 2) (e.g. trail segments
+    start and end points), return the boolean mask of items which do not map to the same
+    pixels of the previous item: drawing only those gives the same picture.
+
+    """
+    keep = np.ones(len(pixels[0]), dtype=bool)
+    if len(keep) > 1:
+        keep[1:] = np.any(np.hstack([np.diff(p, axis=0) for p in pixels]) != 0, axis=1)
+    return keep
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 18:10:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 18:10:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: envelope
+
+********
+Envelope
+********
+
+Map the launch envelope (capture region) of a scenario over two of its parameters: the
+parameter plane is covered with a coarse grid whose cells are recursively split (quadtree
+refinement) only where their corners disagree on hit/miss, so that simulations are spent along
+the envelope boundary.
+
+Scenario parameters are addressed by dotted paths into the scenario dictionary (see runner
+module), e.g. 't0.pos.0' for Target start x or 'm0.he' for Missile heading error::
+
+    env = map_envelope(runner.make_scenario(m0={'guidance': 'apng'}),
+                       't0.pos.0', (20, 70), 't0.pos.1', (10, 60), processes=4)
+    env.heatmap, env.boundary
+
+Scenarios using png.ppn or png.apng guidance are evaluated by default as a single vectorized
+batch (see batch_engine), any other on a pool of worker processes (see runner.run_sweep).
+
+    """
+
+import copy
+
+import numpy as np
+
+import runner
+import batch_engine
+
+
+def set_param(scenario, path, value):
+    """
+.. function:: set_param(scenario, path, value)
+
+    Set :samp:`scenario` parameter addressed by :samp:`path` dotted path to :samp:`value`
+    (tuples along the path are converted to lists).
+
+    """
+    keys = path.split('.')
+    node = scenario
+    for key in keys[:-1]:
+        key = int(key) if isinstance(node, list) else key
+        if isinstance(node[key], tuple):
+            node[key] = list(node[key])
+        node = node[key]
+    node[int(keys[-1]) if isinstance(node, list) else keys[-1]] = value
+
+
+class Envelope:
+    """
+==================
+The Envelope class
+==================
+
+.. class:: Envelope(x_range, y_range, resolution, hits, leaves)
+
+    Hold map_envelope output over :samp:`x_range`, :samp:`y_range` parameters ranges sampled on
+    a :samp:`resolution` x :samp:`resolution` cells lattice, where :samp:`hits` maps evaluated
+    lattice points (i, j) to hit/miss booleans and :samp:`leaves` lists refined (i, j, size)
+    cells.
+    The following attributes are available:
+
+        * :samp:`heatmap` (resolution, resolution) array of hit fraction of each lattice cell
+          leaf corners, indexed [y, x];
+        * :samp:`boundary` list of polylines (arrays of (x, y) parameter values) separating hit
+          and miss regions, longest first; closed polylines end with their first point;
+        * :samp:`runs` number of simulations run.
+
+    """
+    def __init__(self, x_range, y_range, resolution, hits, leaves):
+        self.x_range, self.y_range = x_range, y_range
+        self.resolution = resolution
+        self.hits = hits
+        self.runs = len(hits)
+
+        self.heatmap = np.zeros((resolution, resolution))
+        for i, j, size in leaves:
+            self.heatmap[j:j + size, i:i + size] = np.mean(
+                [hits[c] for c in _corners(i, j, size)])
+        self.boundary = self._boundary(leaves)
+
+    def to_param(self, i, j):
+        """
+.. method:: to_param(i, j)
+
+        Convert lattice coordinates to parameters values.
+
+        """
+        return _to_param(self.x_range, self.y_range, self.resolution, i, j)
+
+    def _boundary(self, leaves):
+        # marching squares over mixed unit cells: edges crossing points are kept doubled so
+        # that lattice coordinates stay integers
+        links = {}
+        for i, j, size in leaves:
+            if size != 1:
+                continue
+            corners = _corners(i, j, 1)
+            crossings = []
+            for a, b in zip(corners, corners[1:] + corners[:1]):
+                if self.hits[a] != self.hits[b]:
+                    crossings.append((a[0] + b[0], a[1] + b[1]))
+            for a, b in zip(crossings[::2], crossings[1::2]):
+                links.setdefault(a, []).append(b)
+                links.setdefault(b, []).append(a)
+
+        polylines = []
+        while links:
+            # start from an open end if any, so that open polylines are walked end to end
+            start = next((p for p, ln in links.items() if len(ln) == 1), next(iter(links)))
+            line = [start]
+            while links.get(line[-1]):
+                nxt = links[line[-1]].pop()
+                links[nxt].remove(line[-1])
+                if not links[line[-1]]:
+                    del links[line[-1]]
+                line.append(nxt)
+            links.pop(line[-1], None)
+            polylines.append(np.array([self.to_param(p[0] / 2, p[1] / 2) for p in line]))
+        return sorted(polylines, key=len, reverse=True)
+
+
+def _to_param(x_range, y_range, resolution, i, j):
+    return (x_range[0] + (x_range[1] - x_range[0]) * i / resolution,
+            y_range[0] + (y_range[1] - y_range[0]) * j / resolution)
+
+
+def _corners(i, j, size):
+    return [(i, j), (i + size, j), (i + size, j + size), (i, j + size)]
+
+
+def evaluate_default(scenarios, processes=None, cache=None):
+    """
+.. function:: evaluate_default(scenarios, processes=None, cache=None)
+
+    Return results of :samp:`scenarios`, run by batch_engine.run_batch if it supports all of
+    them, else by runner.run_sweep on :samp:`processes` worker processes.
+    If a results_cache.ResultCache is passed as :samp:`cache`, scenarios already computed by the
+    same engine are not run again and new results are stored into it, keyed by engine.
+
+    """
+    scenarios = list(scenarios)
+    if not all(batch_engine.supports(s) for s in scenarios):
+        return runner.run_sweep(scenarios, processes, cache)
+
+    results = [None] * len(scenarios)
+    if cache is not None:
+        results = [cache.get(s, engine='batch') for s in scenarios]
+    todo = [i for i, result in enumerate(results) if result is None]
+    if todo:
+        for i, result in zip(todo, batch_engine.run_batch([scenarios[i] for i in todo])):
+            results[i] = result
+            if cache is not None:
+                cache.put(scenarios[i], result, engine='batch')
+    return results
+
+
+def map_envelope(base, x_param, x_range, y_param, y_range, initial=8, max_depth=4,
+                 evaluate=None, processes=None, cache=None):
+    """
+.. function:: map_envelope(base, x_param, x_range, y_param, y_range, initial=8, max_depth=4, evaluate=None, processes=None, cache=None)
+
+    Map :samp:`base` scenario launch envelope over :samp:`x_param` and :samp:`y_param`
+    parameters (dotted paths, see set_param) spanning :samp:`x_range` and :samp:`y_range`, and
+    return an Envelope.
+
+    The plane is first sampled on an :samp:`initial` x :samp:`initial` cells grid, mixed cells
+    are then split up to :samp:`max_depth` times, so the finest resolution is
+    initial * 2**max_depth cells per side.
+    Every refinement level is evaluated as a single batch through :samp:`evaluate`, a function
+    taking a list of scenarios and returning the list of their results; by default
+    batch_engine.run_batch is used when it supports every scenario, runner.run_sweep with
+    :samp:`processes` worker processes otherwise, both with :samp:`cache` results cache.
+
+    """
+    if evaluate is None:
+        evaluate = lambda scenarios: evaluate_default(scenarios, processes, cache)
+    resolution = initial * 2**max_depth
+    hits = {}
+
+    def scenario(point):
+        sc = copy.deepcopy(base)
+        x, y = _to_param(x_range, y_range, resolution, *point)
+        set_param(sc, x_param, float(x))
+        set_param(sc, y_param, float(y))
+        return sc
+
+    def run(points):
+        points = sorted(set(p for p in points if p not in hits))
+        for point, result in zip(points, evaluate([scenario(p) for p in points])):
+            hits[point] = bool(result['hit'])
+
+    size = 2**max_depth
+    cells = [(i * size, j * size, size) for i in range(initial) for j in range(initial)]
+    leaves = []
+    while cells:
+        run(c for cell in cells for c in _corners(*cell))
+        split = []
+        for i, j, size in cells:
+            mixed = len(set(hits[c] for c in _corners(i, j, size))) > 1
+            if mixed and size > 1:
+                half = size // 2
+                split += [(i, j, half), (i + half, j, half),
+                          (i, j + half, half), (i + half, j + half, half)]
+            else:
+                leaves.append((i, j, size))
+        cells = split
+
+    return Envelope(x_range, y_range, resolution, hits, leaves)
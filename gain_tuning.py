@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 19:10:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 19:10:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: gain_tuning
+
+***********
+Gain Tuning
+***********
+
+Find the guidance gain, or gain schedule, minimizing an objective over a scenario or a
+scenario distribution (a list of scenarios, see runner module).
+Every candidate set is evaluated as a single batch_engine batch: candidates x scenarios
+engagements stepped together.
+
+Available objectives:
+
+    * 'miss_distance' mean miss distance;
+    * 'peak_acc' mean peak absolute Missile acceleration;
+    * 'integrated_acc' mean integrated absolute Missile acceleration.
+
+Acceleration objectives are penalized by :samp:`miss_penalty` times the miss distance of
+missed runs, so that gains trading hits for smaller accelerations are not selected.
+
+    """
+
+import numpy as np
+
+import batch_engine
+
+OBJECTIVES = ['miss_distance', 'peak_acc', 'integrated_acc']
+
+
+def _scores(results, objective, miss_penalty):
+    if objective not in OBJECTIVES:
+        raise ValueError('unknown objective: %s' % objective)
+    score = np.array([r[objective] for r in results])
+    if objective != 'miss_distance':
+        score += miss_penalty * np.array([0. if r['hit'] else r['miss_distance']
+                                          for r in results])
+    return score
+
+
+def evaluate_gains(scenarios, gains, objective='miss_distance', miss_penalty=1e3,
+                   schedule_times=None):
+    """
+.. function:: evaluate_gains(scenarios, gains, objective='miss_distance', miss_penalty=1e3, schedule_times=None)
+
+    Return the mean :samp:`objective` over :samp:`scenarios` of every candidate in
+    :samp:`gains`: a (G,) array of gains or a (G, K) array of gain schedules over
+    :samp:`schedule_times` (see batch_engine.BatchEngagement).
+    All G x len(scenarios) runs are evaluated as a single batch.
+
+    """
+    gains = np.asarray(gains, dtype=np.float64)
+    batch_gains = np.repeat(gains, len(scenarios), axis=0)
+    results = batch_engine.run_batch([s for _ in gains for s in scenarios],
+                                     batch_gains, schedule_times)
+    return _scores(results, objective, miss_penalty).reshape(len(gains), -1).mean(axis=1)
+
+
+def optimize_gain(scenarios, bounds=(1., 8.), objective='miss_distance', samples=16,
+                  iterations=4, miss_penalty=1e3):
+    """
+.. function:: optimize_gain(scenarios, bounds=(1., 8.), objective='miss_distance', samples=16, iterations=4, miss_penalty=1e3)
+
+    Return (best gain, objective value) over :samp:`scenarios`.
+    :samp:`samples` gains evenly spaced inside :samp:`bounds` are evaluated as one batch, then
+    the search interval is narrowed around the best one, :samp:`iterations` times.
+
+    """
+    lo, hi = bounds
+    best = (None, np.inf)
+    for _ in range(iterations):
+        gains = np.linspace(lo, hi, samples)
+        scores = evaluate_gains(scenarios, gains, objective, miss_penalty)
+        i = int(np.argmin(scores))
+        if scores[i] < best[1]:
+            best = (float(gains[i]), float(scores[i]))
+        step = gains[1] - gains[0]
+        lo, hi = max(bounds[0], gains[i] - step), min(bounds[1], gains[i] + step)
+    return best
+
+
+def optimize_schedule(scenarios, schedule_times, initial_gain=3., bounds=(1., 8.),
+                      objective='miss_distance', iterations=20, perturbation=0.1, step=1.,
+                      miss_penalty=1e3):
+    """
+.. function:: optimize_schedule(scenarios, schedule_times, initial_gain=3., bounds=(1., 8.), objective='miss_distance', iterations=20, perturbation=0.1, step=1., miss_penalty=1e3)
+
+    Return (best gain schedule, objective value) over :samp:`scenarios` for a piecewise
+    constant schedule switching gain at :samp:`schedule_times`.
+    Starting from a constant :samp:`initial_gain` schedule, every iteration evaluates the
+    current schedule together with its central finite difference perturbations (by
+    :samp:`perturbation`) as one batch, then moves against the gradient by :samp:`step`,
+    halving it whenever no improvement is found.
+    Gains are kept inside :samp:`bounds`.
+
+    """
+    k = len(schedule_times) + 1
+    current = np.full(k, float(initial_gain))
+    eye = np.eye(k) * perturbation
+    best = direction = None
+    for _ in range(iterations):
+        candidates = np.clip(np.vstack([current, current + eye, current - eye]), *bounds)
+        scores = evaluate_gains(scenarios, candidates, objective, miss_penalty, schedule_times)
+        if best is not None and scores[0] >= best[1]:
+            # last move did not improve: shorten it
+            step /= 2
+            current = np.clip(best[0] - step * direction, *bounds)
+            continue
+
+        best = (current.copy(), float(scores[0]))
+        grad = (scores[1:k + 1] - scores[k + 1:]) / (2 * perturbation)
+        norm = np.linalg.norm(grad)
+        if not norm:
+            break
+        direction = grad / norm
+        current = np.clip(current - step * direction, *bounds)
+    return best
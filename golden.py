@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 21:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 21:40:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: golden
+
+*******************
+Golden Trajectories
+*******************
+
+Validate alternative engines against the reference physics (players.Player.update_nav and
+png guidance functions, as run by runner.run_scenario).
+
+A fixed CORPUS of scenarios is run through the reference path once and stored, trajectories
+and summary metrics, in a compressed NumPy archive. Any engine, a function taking a list of
+scenarios and returning runner.run_scenario like results (trajectory included), can then be
+compared against it::
+
+    reports = check(lambda scenarios: batch_engine.run_batch(scenarios, trajectory=True))
+    failed = [name for name, report in reports.items() if not report['ok']]
+
+Run as a script to regenerate goldens after an intended physics change::
+
+    python golden.py [path]
+
+    """
+
+import os
+import sys
+
+import numpy as np
+
+import runner
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'tests', 'golden', 'trajectories.npz')
+
+CORPUS = {
+    'head_on_ppn': runner.make_scenario({'pos': (0, 0), 'he': 0}, {'pos': (200, 0), 'vel': -10}),
+    'default_ppn': runner.make_scenario(),
+    'default_apng': runner.make_scenario({'guidance': 'apng'}),
+    'maneuver_ppn': runner.make_scenario(t0={'acc': 2}),
+    'maneuver_apng': runner.make_scenario({'guidance': 'apng'}, {'acc': 2}),
+    'high_gain': runner.make_scenario({'guidance_gain': 5}, {'acc': -1}),
+    'tail_chase': runner.make_scenario({'pos': (0, 0), 'he': 0, 'vel': 30},
+                                       {'pos': (60, 10), 'vel': 15}),
+    'low_gain_miss': runner.make_scenario({'pos': (0, 0), 'he': -60, 'guidance_gain': 1},
+                                          {'pos': (80, 60), 'vel': 10, 'acc': 3},
+                                          max_time=10)
+}
+
+SIGNALS = ['missile', 'target', 'acc']
+METRICS = ['hit', 'miss_distance', 'time_of_flight', 'peak_acc', 'integrated_acc', 'steps']
+
+DEFAULT_TOLERANCES = {'missile': 1e-6, 'target': 1e-6, 'acc': 1e-6, 'metrics': 1e-6}
+
+
+def reference(scenarios):
+    """
+.. function:: reference(scenarios)
+
+    Run :samp:`scenarios` through runner.run_scenario and return their results, trajectories
+    included.
+
+    """
+    return [runner.run_scenario(s, trajectory=True) for s in scenarios]
+
+
+def generate(path=DEFAULT_PATH, corpus=None):
+    """
+.. function:: generate(path=DEFAULT_PATH, corpus=None)
+
+    Run :samp:`corpus` (default CORPUS) through the reference engine and store results inside
+    :samp:`path` archive.
+
+    """
+    corpus = CORPUS if corpus is None else corpus
+    arrays = {}
+    for name, result in zip(corpus, reference(list(corpus.values()))):
+        arrays[name + '.metrics'] = np.array([float(result[m]) for m in METRICS])
+        for key, values in result['trajectory'].items():
+            arrays[name + '.' + key] = values
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, **arrays)
+
+
+def load(path=DEFAULT_PATH):
+    """
+.. function:: load(path=DEFAULT_PATH)
+
+    Return golden results stored in :samp:`path` as a dictionary of runner.run_scenario like
+    results keyed by scenario name.
+
+    """
+    goldens = {}
+    with np.load(path) as data:
+        for key in data.files:
+            name, field = key.rsplit('.', 1)
+            result = goldens.setdefault(name, {'trajectory': {}})
+            if field == 'metrics':
+                result.update(zip(METRICS, data[key].tolist()))
+            else:
+                result['trajectory'][field] = data[key]
+    return goldens
+
+
+def compare(golden, candidate, tolerances=None):
+    """
+.. function:: compare(golden, candidate, tolerances=None)
+
+    Compare :samp:`candidate` result against :samp:`golden` one and return a report dictionary:
+
+        * one entry per signal of SIGNALS with 'max_error' (absolute, over common samples,
+          Euclidean for positions) and 'first_divergence' (time of first sample whose error
+          exceeds tolerance, or which is missing from one of the two runs, None if there is
+          none);
+        * 'metrics' with absolute errors of METRICS values;
+        * 'ok' whether everything is within tolerances.
+
+    :samp:`tolerances` updates DEFAULT_TOLERANCES.
+
+    """
+    tol = dict(DEFAULT_TOLERANCES, **(tolerances or {}))
+    ref, cand = golden['trajectory'], candidate['trajectory']
+    t = ref['t']
+    common = min(len(t), len(cand['t']))
+    longest = ref['t'] if len(t) >= len(cand['t']) else cand['t']
+
+    report = {'ok': True}
+    for signal in SIGNALS:
+        error = np.abs(np.asarray(cand[signal][:common]) - ref[signal][:common])
+        if error.ndim > 1:
+            error = np.hypot(error[:, 0], error[:, 1])
+        over = np.flatnonzero(~(error <= tol[signal]))
+        if len(over):
+            first = float(t[over[0]])
+        elif common < len(longest):
+            first = float(longest[common])
+        else:
+            first = None
+        report[signal] = {'max_error': float(error.max()) if common else 0.,
+                          'first_divergence': first}
+        report['ok'] &= first is None
+
+    report['metrics'] = {m: abs(float(candidate[m]) - float(golden[m])) for m in METRICS}
+    report['ok'] &= all(e <= tol['metrics'] for e in report['metrics'].values())
+    return report
+
+
+def check(engine, path=DEFAULT_PATH, tolerances=None):
+    """
+.. function:: check(engine, path=DEFAULT_PATH, tolerances=None)
+
+    Run CORPUS scenarios stored in :samp:`path` through :samp:`engine` and return compare()
+    reports keyed by scenario name.
+
+    """
+    goldens = load(path)
+    names = [name for name in CORPUS if name in goldens]
+    results = engine([CORPUS[name] for name in names])
+    return {name: compare(goldens[name], result, tolerances)
+            for name, result in zip(names, results)}
+
+
+if __name__ == '__main__':
+    generate(*sys.argv[1:2])
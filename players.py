@@ -31,13 +31,27 @@ import numpy as np
 
 #TODO: acceleration only perpendicular to velocity in current implementation, make generic
 
+def _state_property(index, doc):
+    # float attribute stored in the player state array, nan meaning not yet assigned
+    def getter(self):
+        value = self._state[index]
+        if value != value:
+            raise AttributeError(doc)
+        return float(value)
+
+    def setter(self, value):
+        self._state[index] = value
+
+    return property(getter, setter, doc=doc)
+
+
 class Player:
     """
 ================
 The Player class
 ================
 
-.. class:: Player(pos, ori, vel, acc)
+.. class:: Player(pos, ori, vel, acc, state=None)
 
     Create a Player instance given its start:
 
@@ -46,9 +60,68 @@ The Player class
         * :samp:`vel` velocity
         * :samp:`acc` acceleration
 
+    Player state is kept in a single float64 array of STATE_SIZE elements laid out as
+    [x, y, vx, vy, ori, acc] (subclasses append their own fields).
+    If :samp:`state` is given it must be such an array, e.g. a row of a batch array shared by
+    many players, and it is used in place; otherwise a new array is allocated.
+    :samp:`pos` and :samp:`vel` are views of the state array.
+
     """
-    def __init__(self, pos, ori, vel, acc):
-        self.pos, self.ori, self.vel, self.acc = list(pos), ori, [vel*np.cos(ori), vel*np.sin(ori)], acc
+    __slots__ = ('_state', '_pos', '_vel')
+
+    STATE_SIZE = 6
+
+    def __init__(self, pos, ori, vel, acc, state=None):
+        if state is None:
+            state = np.empty(self.STATE_SIZE)
+        self._state = state
+        self._pos, self._vel = state[0:2], state[2:4]
+        self._state[:] = np.nan
+        self._state[0:2] = pos
+        self._state[2:4] = (vel*np.cos(ori), vel*np.sin(ori))
+        self._state[4] = ori
+        self._state[5] = acc
+
+    @property
+    def pos(self):
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        self._state[0:2] = value
+
+    @property
+    def vel(self):
+        return self._vel
+
+    @vel.setter
+    def vel(self, value):
+        self._state[2:4] = value
+
+    ori = _state_property(4, 'orientation')
+    acc = _state_property(5, 'acceleration')
+
+    @property
+    def state(self):
+        return self._state
+
+    def snapshot(self):
+        """
+.. method:: snapshot()
+
+        Return a copy of Player state array.
+
+        """
+        return self._state.copy()
+
+    def restore(self, snapshot):
+        """
+.. method:: restore(snapshot)
+
+        Restore Player state from a :samp:`snapshot` array.
+
+        """
+        self._state[:] = snapshot
 
     def update_nav(self, dt):
         """
@@ -61,20 +134,22 @@ The Player class
     perpendicular to velocity vector.
 
         """
-        self.pos[0] += self.vel[0] * dt
-        self.pos[1] += self.vel[1] * dt
-        if self.acc:
-            self.ori += (self.acc/np.sqrt(self.vel[0]**2 + self.vel[1]**2)) * dt
-            while self.ori < 0:
-                self.ori = np.pi * 2 - self.ori
-            while self.ori > np.pi * 2:
-                self.ori -= np.pi * 2
-
-            vel_inc = self.acc * dt # has to be distributed along x,y axis since
-                                    # this value represents the value perpendicular
-                                    # to velocity vector (with angle ori)
-            self.vel[0] += vel_inc * np.cos(self.ori + np.pi/2)
-            self.vel[1] += vel_inc * np.sin(self.ori + np.pi/2)
+        x, y, vx, vy, ori, acc = self._state[0:6].tolist()
+        x += vx * dt
+        y += vy * dt
+        if acc:
+            ori += (acc/np.sqrt(vx**2 + vy**2)) * dt
+            while ori < 0:
+                ori = np.pi * 2 - ori
+            while ori > np.pi * 2:
+                ori -= np.pi * 2
+
+            vel_inc = acc * dt  # has to be distributed along x,y axis since
+                                # this value represents the value perpendicular
+                                # to velocity vector (with angle ori)
+            vx += vel_inc * np.cos(ori + np.pi/2)
+            vy += vel_inc * np.sin(ori + np.pi/2)
+        self._state[0:5] = (x, y, vx, vy, ori)
 
 
 class Missile(Player):
@@ -83,7 +158,7 @@ class Missile(Player):
 The Missile class
 =================
 
-.. class:: Missile(pos, ori, vel, acc, guidance_data, sensors_layer)
+.. class:: Missile(pos, ori, vel, acc, guidance_data, sensors_layer, state=None)
 
     Create a Missile instance.
     A Missile is a player capable of updating its acceleration based on a certain guidance law and 
@@ -91,8 +166,8 @@ The Missile class
 
     For its initialization the following parameters are needed:
 
-        * :samp:`pos`, :samp:`ori`, :samp:`vel`, :samp:`acc` with the same meaning of Player base 
-           class;
+        * :samp:`pos`, :samp:`ori`, :samp:`vel`, :samp:`acc`, :samp:`state` with the same meaning
+          of Player base class;
 
         * :samp:`guidance_data` is a dictionary with 'guidance' and 'guidance_gain' keys:
           'guidance' value must be a function representing a desired guidance law used to update
@@ -122,9 +197,26 @@ The Missile class
                     ...
                     return { 'position': player.pos + some_noise, 'acceleration': player.acc }
 
+    Guidance functions may only set the attributes listed in GUIDANCE_FIELDS (besides
+    :samp:`acc`): they are stored in the Missile state array after Player ones.
+
     """
-    def __init__(self, pos, ori, vel, acc, guidance_data, sensors_layer):
-        Player.__init__(self, pos, ori, vel, acc)
+    GUIDANCE_FIELDS = ['range', 'los_angle', 'closing_velocity', 'los_rate', 'prev_range',
+                       'prev_los_angle']
+
+    __slots__ = ('sensors_layer', 'guidance_gain', 'update_acc')
+
+    STATE_SIZE = Player.STATE_SIZE + len(GUIDANCE_FIELDS)
+
+    range = _state_property(Player.STATE_SIZE, 'range')
+    los_angle = _state_property(Player.STATE_SIZE + 1, 'los_angle')
+    closing_velocity = _state_property(Player.STATE_SIZE + 2, 'closing_velocity')
+    los_rate = _state_property(Player.STATE_SIZE + 3, 'los_rate')
+    prev_range = _state_property(Player.STATE_SIZE + 4, 'prev_range')
+    prev_los_angle = _state_property(Player.STATE_SIZE + 5, 'prev_los_angle')
+
+    def __init__(self, pos, ori, vel, acc, guidance_data, sensors_layer, state=None):
+        Player.__init__(self, pos, ori, vel, acc, state)
         self.sensors_layer = sensors_layer()
         self.guidance_gain = guidance_data['guidance_gain']
         self.update_acc = types.MethodType(guidance_data['guidance'], self)
@@ -135,11 +227,13 @@ class Target(Player):
 The Target class
 =================
 
-.. class:: Target(pos, ori, vel, acc)
+.. class:: Target(pos, ori, vel, acc, state=None)
 
-    Create a Missile instance.
+    Create a Target instance.
     In current implementation a Target is a simple Player with no additional methods or attributes.
 
     """
-    def __init__(self, pos, ori, vel, acc):
-        Player.__init__(self, pos, ori, vel, acc)
+    __slots__ = ()
+
+    def __init__(self, pos, ori, vel, acc, state=None):
+        Player.__init__(self, pos, ori, vel, acc, state)
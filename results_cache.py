@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 16:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 16:40:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: results_cache
+
+*************
+Results Cache
+*************
+
+Content-addressed on-disk cache of scenario results (see runner module).
+
+Every entry is keyed by a hash of the canonical scenario configuration, of the engine which
+computed it (see ENGINES) and of that engine code version, and is made of a json summary file
+and, optionally, a compressed npz trajectory file.
+Engines do not agree bit for bit, so results of one are never returned for another.
+
+    """
+
+import os
+import json
+import glob
+import hashlib
+import tempfile
+
+import numpy as np
+
+import runner
+
+# modules whose source defines scenario results, by engine
+ENGINES = {
+    'runner': ['players', 'png', 'sensors_layers', 'runner'],
+    'batch': ['runner', 'batch_engine']
+}
+
+
+def _code_version(modules):
+    sha = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for mod in modules:
+        with open(os.path.join(here, mod + '.py'), 'rb') as src:
+            sha.update(src.read())
+    return sha.hexdigest()
+
+CODE_VERSIONS = {engine: _code_version(modules) for engine, modules in ENGINES.items()}
+CODE_VERSION = CODE_VERSIONS['runner']
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # 3 and 3.0 must address the same entry
+        return float(value)
+    if callable(value):
+        return value.__name__
+    return value
+
+
+def scenario_key(scenario, engine='runner'):
+    """
+.. function:: scenario_key(scenario, engine='runner')
+
+    Return the hex digest identifying :samp:`scenario` results computed by :samp:`engine` (a
+    key of ENGINES): scenario is completed with runner defaults and serialized canonically, so
+    that equivalent configurations share the same key.
+
+    """
+    scenario = runner.make_scenario(scenario.get('m0'), scenario.get('t0'),
+                                    **{k: v for k, v in scenario.items() if k not in ('m0', 't0')})
+    blob = json.dumps({'scenario': _canonical(scenario), 'engine': engine,
+                       'code': CODE_VERSIONS[engine]},
+                      sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+=====================
+The ResultCache class
+=====================
+
+.. class:: ResultCache(path, max_bytes=256 * 2**20)
+
+    Create a ResultCache instance storing entries inside :samp:`path` directory.
+    When total entries size exceeds :samp:`max_bytes` least recently used entries are evicted.
+
+    Entries are written to temporary files and atomically renamed, the summary file last, so
+    several processes can safely share the same cache directory: a reader either finds a
+    complete entry or no entry at all.
+
+    """
+    def __init__(self, path, max_bytes=256 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key, ext):
+        return os.path.join(self.path, key + ext)
+
+    def _write(self, dst, write_fn):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                write_fn(fout)
+            os.replace(tmp, dst)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def get(self, scenario, trajectory=False, engine='runner'):
+        """
+.. method:: get(scenario, trajectory=False, engine='runner')
+
+        Return cached :samp:`scenario` result computed by :samp:`engine` or None if not
+        available.
+        If :samp:`trajectory` is True, entries stored without trajectory are considered missing.
+
+        """
+        key = scenario_key(scenario, engine)
+        try:
+            with open(self._file(key, '.json')) as fin:
+                result = json.load(fin)
+            if trajectory:
+                with np.load(self._file(key, '.npz')) as traj:
+                    result['trajectory'] = {k: traj[k] for k in traj.files}
+            # mark entry as recently used
+            os.utime(self._file(key, '.json'))
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, scenario, result, engine='runner'):
+        """
+.. method:: put(scenario, result, engine='runner')
+
+        Store :samp:`scenario` result computed by :samp:`engine` (as returned by
+        runner.run_scenario or batch_engine.run_batch), then evict least recently used entries
+        if needed.
+
+        """
+        key = scenario_key(scenario, engine)
+        summary = {k: v for k, v in result.items() if k != 'trajectory'}
+        if 'trajectory' in result:
+            self._write(self._file(key, '.npz'),
+                        lambda fout: np.savez_compressed(fout, **result['trajectory']))
+        self._write(self._file(key, '.json'),
+                    lambda fout: fout.write(json.dumps(summary).encode('utf-8')))
+        self.evict()
+
+    def evict(self):
+        """
+.. method:: evict()
+
+        Remove least recently used entries until cache size is under max_bytes.
+
+        """
+        entries = []
+        total = 0
+        for summary in glob.glob(os.path.join(self.path, '*.json')):
+            key = summary[:-len('.json')]
+            try:
+                stat = os.stat(summary)
+            except OSError:
+                continue
+            size = stat.st_size
+            try:
+                size += os.path.getsize(key + '.npz')
+            except OSError:
+                pass
+            entries.append((stat.st_mtime, key, size))
+            total += size
+
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for ext in ('.json', '.npz'):
+                try:
+                    os.unlink(key + ext)
+                except OSError:
+                    pass
+            total -= size
+
+    def clear(self):
+        """
+.. method:: clear()
+
+        Remove every cache entry.
+
+        """
+        for entry in glob.glob(os.path.join(self.path, '*.json')):
+            for ext in ('.json', '.npz'):
+                try:
+                    os.unlink(entry[:-len('.json')] + ext)
+                except OSError:
+                    pass
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 16:20:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 16:20:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: runner
+
+******
+Runner
+******
+
+Run missile-target intercept scenarios headless (no animation, no plots) and collect summary
+metrics, optionally together with the full trajectory.
+
+A scenario is a plain dictionary, so that it can be hashed, stored and sent to worker processes::
+
+    {
+        'm0': {'pos': (10, 5), 'vel': 40, 'he': -20, 'guidance': 'ppn', 'guidance_gain': 3},
+        't0': {'pos': (50, 30), 'vel': 5, 'acc': 0},
+        'dt': 0.005,
+        'tol': 0.5,
+        'max_time': 60,
+        'escape': 20
+    }
+
+where :samp:`m0`, :samp:`t0`, :samp:`dt` and :samp:`tol` have the same meaning they have for
+sim.Simulator ('guidance' is the name of a png guidance function), :samp:`max_time` is the
+simulated time after which the run is stopped and :samp:`escape` is how far (in meters) the range
+may grow past the closest point of approach before the run is considered a miss.
+
+    """
+
+import copy
+import multiprocessing
+
+import numpy as np
+
+import players
+import png
+import sensors_layers
+
+DEFAULT_SCENARIO = {
+    'm0': {'pos': (10, 5), 'vel': 40, 'he': -20, 'guidance': 'ppn', 'guidance_gain': 3},
+    't0': {'pos': (50, 30), 'vel': 5, 'acc': 0},
+    'dt': 0.005,
+    'tol': 0.5,
+    'max_time': 60,
+    'escape': 20
+}
+
+
+def make_scenario(m0=None, t0=None, **params):
+    """
+.. function:: make_scenario(m0=None, t0=None, **params)
+
+    Return a new scenario dictionary built from DEFAULT_SCENARIO, updated with :samp:`m0` and
+    :samp:`t0` keys and any other top level parameter (dt, tol, max_time, escape).
+
+    """
+    scenario = copy.deepcopy(DEFAULT_SCENARIO)
+    scenario['m0'].update(m0 or {})
+    scenario['t0'].update(t0 or {})
+    scenario.update(params)
+    return scenario
+
+
+def guidance_fn(guidance):
+    """
+.. function:: guidance_fn(guidance)
+
+    Return png guidance function given its name (guidance functions are returned unchanged).
+
+    """
+    if isinstance(guidance, str):
+        return getattr(png, guidance)
+    return guidance
+
+
+class Engagement:
+    """
+====================
+The Engagement class
+====================
+
+.. class:: Engagement(m0, t0, sensors_layer=sensors_layers.PerfectSensors)
+
+    Create an Engagement instance: a Missile and a Target initialized from :samp:`m0` and
+    :samp:`t0` configuration dictionaries exactly like sim.Simulator does, stepped without any
+    visualization.
+
+    """
+    def __init__(self, m0, t0, sensors_layer=sensors_layers.PerfectSensors):
+        guidance_data = {
+            'guidance': guidance_fn(m0['guidance']),
+            'guidance_gain': m0['guidance_gain'],
+        }
+
+        losangle0 = np.arctan2(t0['pos'][1] - m0['pos'][1], t0['pos'][0] - m0['pos'][0])
+        self.missile = players.Missile(m0['pos'], losangle0 + np.radians(m0['he']),
+                                       m0['vel'], 0, guidance_data, sensors_layer)
+        self.target = players.Target(t0['pos'], losangle0, t0['vel'], t0['acc'])
+
+    def step(self, dt):
+        """
+.. method:: step(dt)
+
+        Let the Missile sense the Target and update its acceleration, then integrate both
+        Players navigation data over :samp:`dt`.
+
+        """
+        sensed = self.missile.sensors_layer.get_data(self.target)
+        nacc = self.missile.update_acc(sensed, dt)
+        self.missile.update_nav(dt)
+        self.target.update_nav(dt)
+        if nacc:
+            self.missile.acc = nacc
+
+    def range(self):
+        """
+.. method:: range()
+
+        Return current Missile/Target distance.
+
+        """
+        return float(np.hypot(self.target.pos[0] - self.missile.pos[0],
+                              self.target.pos[1] - self.missile.pos[1]))
+
+    def collided(self, tol):
+        """
+.. method:: collided(tol)
+
+        Check missile and target collision under :samp:`tol` allowed tolerance condition.
+
+        """
+        return (abs(self.missile.pos[0] - self.target.pos[0]) < tol and
+                abs(self.missile.pos[1] - self.target.pos[1]) < tol)
+
+
+def run_scenario(scenario, trajectory=False):
+    """
+.. function:: run_scenario(scenario, trajectory=False)
+
+    Run :samp:`scenario` until interception, miss or timeout and return a summary dictionary
+    with the following keys:
+
+        * :samp:`hit` whether the Missile reached the Target under tolerance;
+        * :samp:`miss_distance` minimum Missile/Target distance;
+        * :samp:`time_of_flight` simulated time at the end of the run;
+        * :samp:`peak_acc` maximum absolute Missile acceleration;
+        * :samp:`integrated_acc` absolute Missile acceleration integrated over time;
+        * :samp:`steps` number of integration steps.
+
+    If :samp:`trajectory` is True a 'trajectory' key is added, holding a dictionary of NumPy
+    arrays: 't', 'missile' and 'target' positions and Missile 'acc'.
+
+    """
+    scenario = make_scenario(scenario.get('m0'), scenario.get('t0'),
+                             **{k: v for k, v in scenario.items() if k not in ('m0', 't0')})
+    dt, tol = scenario['dt'], scenario['tol']
+    max_steps = int(round(scenario['max_time'] / dt))
+
+    eng = Engagement(scenario['m0'], scenario['t0'])
+    log = [] if trajectory else None
+
+    hit = False
+    min_range = eng.range()
+    peak_acc = integrated_acc = 0.
+    steps = 0
+    while steps < max_steps:
+        eng.step(dt)
+        steps += 1
+
+        acc = abs(float(eng.missile.acc))
+        peak_acc = max(peak_acc, acc)
+        integrated_acc += acc * dt
+        rng = eng.range()
+        min_range = min(min_range, rng)
+        if log is not None:
+            log.append((steps * dt, eng.missile.pos[0], eng.missile.pos[1],
+                        eng.target.pos[0], eng.target.pos[1], float(eng.missile.acc)))
+
+        if eng.collided(tol):
+            hit = True
+            break
+        if rng > min_range + scenario['escape']:
+            break
+
+    result = {
+        'hit': hit,
+        'miss_distance': min_range,
+        'time_of_flight': steps * dt,
+        'peak_acc': peak_acc,
+        'integrated_acc': integrated_acc,
+        'steps': steps
+    }
+    if log is not None:
+        log = np.array(log, dtype=np.float64).reshape(-1, 6)
+        result['trajectory'] = {
+            't': log[:, 0],
+            'missile': log[:, 1:3],
+            'target': log[:, 3:5],
+            'acc': log[:, 5]
+        }
+    return result
+
+
+def _run(args):
+    return run_scenario(*args)
+
+
+def run_sweep(scenarios, processes=None, cache=None, trajectory=False):
+    """
+.. function:: run_sweep(scenarios, processes=None, cache=None, trajectory=False)
+
+    Run every scenario in :samp:`scenarios` and return the list of results, in the same order.
+    Scenarios are run on a pool of :samp:`processes` worker processes (1 runs them in the
+    calling process).
+    If a results_cache.ResultCache is passed as :samp:`cache`, scenarios already computed are
+    not run again and new results are stored into it.
+
+    """
+    scenarios = list(scenarios)
+    results = [None] * len(scenarios)
+    todo = []
+    for i, scenario in enumerate(scenarios):
+        if cache is not None:
+            results[i] = cache.get(scenario, trajectory)
+        if results[i] is None:
+            todo.append(i)
+
+    jobs = [(scenarios[i], trajectory) for i in todo]
+    pool = None
+    if processes != 1 and len(jobs) > 1:
+        pool = multiprocessing.Pool(processes)
+    try:
+        done = pool.imap(_run, jobs) if pool is not None else map(_run, jobs)
+        for i, result in zip(todo, done):
+            results[i] = result
+            if cache is not None:
+                cache.put(scenarios[i], result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return results
+
+
+def imap_scenarios(scenarios, processes=None, trajectory=False, chunksize=1):
+    """
+.. function:: imap_scenarios(scenarios, processes=None, trajectory=False, chunksize=1)
+
+    Generator yielding :samp:`scenarios` results as soon as they are available (in completion
+    order) from a pool of :samp:`processes` worker processes.
+    Closing the generator before exhaustion terminates outstanding runs.
+
+    """
+    pool = multiprocessing.Pool(processes)
+    try:
+        yield from pool.imap_unordered(_run, ((s, trajectory) for s in scenarios), chunksize)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
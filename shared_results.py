@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 21:20:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 21:20:00
+
+# Copyright 2026 PYIntercept contributors
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+.. module:: shared_results
+
+**************
+Shared Results
+**************
+
+Return scenario results and full trajectories from worker processes through shared memory:
+the parent process preallocates result and trajectory arrays, every worker writes its
+scenario slot in place and only sends back the slot index.
+
+Example::
+
+    with run_sweep_shared(scenarios, processes=4, max_steps=2000) as shr:
+        shr.results['miss_distance'], shr.result(0)['trajectory']['missile']
+
+Every trajectory slot is sized for max_steps steps, by default the max_time timeout (12000
+steps, about 0.6 MB per scenario, for runner.DEFAULT_SCENARIO) even if typical runs end much
+earlier: large sweeps should pass a smaller max_steps. Shared memory (/dev/shm, 64 MB by default
+inside Docker containers) is only reserved when written, so the whole size is checked against
+the free space beforehand instead of letting workers die of SIGBUS.
+
+    """
+
+import os
+import weakref
+import concurrent.futures
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import runner
+
+RESULT_FIELDS = ['hit', 'miss_distance', 'time_of_flight', 'peak_acc', 'integrated_acc', 'steps']
+
+# trajectory columns: t, missile x, y, target x, y, missile acc
+TRAJECTORY_COLUMNS = 6
+
+
+# where multiprocessing.shared_memory blocks live
+SHM_DIR = '/dev/shm'
+
+
+def shm_free():
+    """
+.. function:: shm_free()
+
+    Return free bytes of SHM_DIR, None if unknown (e.g. on platforms without it).
+
+    """
+    try:
+        stat = os.statvfs(SHM_DIR)
+    except (OSError, AttributeError):
+        return None
+    return stat.f_bavail * stat.f_frsize
+
+
+def _release(blocks, unlink):
+    for shm in blocks:
+        shm.close()
+        if unlink:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedResults:
+    """
+=======================
+The SharedResults class
+=======================
+
+.. class:: SharedResults(count, max_steps, max_bytes=None)
+
+    Create a SharedResults instance allocating, in shared memory, results of :samp:`count`
+    scenarios and their trajectories, up to :samp:`max_steps` steps each (longer ones are
+    truncated). MemoryError is raised if more than :samp:`max_bytes` are needed (see
+    nbytes()).
+    The following NumPy arrays are available:
+
+        * :samp:`results` structured (count,) array with RESULT_FIELDS fields, nan until written
+          (steps -1);
+        * :samp:`trajectories` (count, max_steps, TRAJECTORY_COLUMNS) array.
+
+    Shared memory is released by close() (or leaving a with block, or garbage collection):
+    arrays and trajectories returned by result() must not be used afterwards.
+
+    """
+    DTYPE = np.dtype([(f, np.int64 if f == 'steps' else np.float64) for f in RESULT_FIELDS])
+
+    def __init__(self, count, max_steps, max_bytes=None, _spec=None):
+        owner = _spec is None
+        if owner:
+            sizes = self._sizes(count, max_steps)
+            if max_bytes is not None and sum(sizes) > max_bytes:
+                raise MemoryError('%d scenarios of %d steps need %d bytes of shared memory, '
+                                  '%d available: pass a smaller max_steps'
+                                  % (count, max_steps, sum(sizes), max_bytes))
+            self._blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        else:
+            self._blocks = [shared_memory.SharedMemory(name=n) for n in _spec['names']]
+        self.count, self.max_steps = count, max_steps
+        self.results = np.ndarray((count,), self.DTYPE, buffer=self._blocks[0].buf)
+        self.trajectories = np.ndarray((count, max_steps, TRAJECTORY_COLUMNS), np.float64,
+                                       buffer=self._blocks[1].buf)
+        if owner:
+            for f in RESULT_FIELDS:
+                self.results[f] = -1 if f == 'steps' else np.nan
+        self._finalizer = weakref.finalize(self, _release, self._blocks, owner)
+
+    @classmethod
+    def _sizes(cls, count, max_steps):
+        return [max(count, 1) * cls.DTYPE.itemsize,
+                max(count * max_steps * TRAJECTORY_COLUMNS, 1) * 8]
+
+    @classmethod
+    def nbytes(cls, count, max_steps):
+        """
+.. method:: nbytes(count, max_steps)
+
+        Return shared memory bytes needed by :samp:`count` scenarios of :samp:`max_steps`
+        steps.
+
+        """
+        return sum(cls._sizes(count, max_steps))
+
+    def spec(self):
+        """
+.. method:: spec()
+
+        Return the picklable description workers need to attach (see attach()).
+
+        """
+        return {'count': self.count, 'max_steps': self.max_steps,
+                'names': [shm.name for shm in self._blocks]}
+
+    @classmethod
+    def attach(cls, spec):
+        """
+.. method:: attach(spec)
+
+        Return a SharedResults instance attached to the shared memory described by
+        :samp:`spec`; closing it does not release the memory.
+
+        """
+        return cls(spec['count'], spec['max_steps'], _spec=spec)
+
+    def store(self, index, result):
+        """
+.. method:: store(index, result)
+
+        Write :samp:`result` (as returned by runner.run_scenario, trajectory included) in
+        :samp:`index` slot.
+
+        """
+        traj = result['trajectory']
+        steps = min(len(traj['t']), self.max_steps)
+        slot = self.trajectories[index]
+        slot[:steps, 0] = traj['t'][:steps]
+        slot[:steps, 1:3] = traj['missile'][:steps]
+        slot[:steps, 3:5] = traj['target'][:steps]
+        slot[:steps, 5] = traj['acc'][:steps]
+        self.results[index] = tuple(result[f] for f in RESULT_FIELDS)
+
+    def result(self, index):
+        """
+.. method:: result(index)
+
+        Return :samp:`index` result as a runner.run_scenario like dictionary, whose trajectory
+        arrays are views of shared memory (None if the result was never written).
+
+        """
+        row = self.results[index]
+        if row['steps'] < 0:
+            return None
+        result = {f: row[f].item() for f in RESULT_FIELDS}
+        result['hit'] = bool(result['hit'])
+        traj = self.trajectories[index, :min(result['steps'], self.max_steps)]
+        result['trajectory'] = {'t': traj[:, 0], 'missile': traj[:, 1:3],
+                                'target': traj[:, 3:5], 'acc': traj[:, 5]}
+        return result
+
+    def close(self):
+        """
+.. method:: close()
+
+        Release shared memory (it is unlinked by the owner instance).
+
+        """
+        self.results = self.trajectories = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_attached = {}
+
+
+def _run_into(args):
+    index, scenario, spec = args
+    key = tuple(spec['names'])
+    if key not in _attached:
+        # attach once per worker process
+        _attached.clear()
+        _attached[key] = SharedResults.attach(spec)
+    _attached[key].store(index, runner.run_scenario(scenario, trajectory=True))
+    return index
+
+
+def run_sweep_shared(scenarios, processes=None, max_steps=None, max_bytes=None):
+    """
+.. function:: run_sweep_shared(scenarios, processes=None, max_steps=None, max_bytes=None)
+
+    Run :samp:`scenarios` on :samp:`processes` worker processes and return a SharedResults
+    holding their results and trajectories (up to :samp:`max_steps` steps, by default the
+    longest scenario max_time / dt, which sizes every slot for the timeout).
+    MemoryError is raised before running anything if more than :samp:`max_bytes` (by default
+    shm_free()) would be needed.
+    If a worker dies or a scenario raises, shared memory is released and the error
+    re-raised.
+
+    """
+    scenarios = [runner.make_scenario(s.get('m0'), s.get('t0'),
+                                      **{k: v for k, v in s.items() if k not in ('m0', 't0')})
+                 for s in scenarios]
+    if max_steps is None:
+        max_steps = max([int(round(s['max_time'] / s['dt'])) for s in scenarios] or [0])
+
+    shr = SharedResults(len(scenarios), max_steps, shm_free() if max_bytes is None else max_bytes)
+    try:
+        spec = shr.spec()
+        with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+            for _ in pool.map(_run_into, [(i, s, spec) for i, s in enumerate(scenarios)],
+                              chunksize=max(1, len(scenarios) // (8 * (processes or 4)))):
+                pass
+    except BaseException:
+        shr.close()
+        raise
+    return shr
@@ -45,6 +45,8 @@ import png
 import data_handlers as dh
 import visualizer as viz
 import sensors_layers
+import decimation
+import alloc_profiler
 
 
 class Simulator:
@@ -53,14 +55,14 @@ class Simulator:
 The Simulator class
 ===================
 
-.. class:: Simulator(sscreen, plt_event, m0, t0, dt, rtf, tol, player_dim=(50,10))
+.. class:: Simulator(sscreen, plt_event, m0, t0, dt, rtf, tol, player_dim=(50,10), follow=False, log_policies=None, keyframe_interval=200, profiler=None)
 
     Create a Simulator instance.
     To have the Simulator correctly running the following parameters are needed:
 
         * :samp:`sscreen` SimScreen instance to output Simulation animation;
         * :samp:`plt_event`  Plotter instance pyqtSignal event needed to update Plotter plts from
-          a different thread;
+          a different thread, or a data_handlers.SharedRing feeding a plotter process;
         * :samp:`m0` Missile configuration info passed as a dictionary composed of the following keys:
           ['pos', 'he', 'vel', 'guidance'] paired respectively with an (x,y) start position tuple,
           heading error angle in degrees, start velocity and a string for desired guidance method;
@@ -74,11 +76,56 @@ The Simulator class
         * :samp:`tol` allowed tolerance on Missile/Target position difference to consider the
           interception ended;
         * :samp:`player_dim` a tuple representing Missile and Target representations dimensions in 
-          pixels. 
+          pixels;
+        * :samp:`follow` whether SimScreen viewport should automatically follow Missile and Target
+          when they leave the visible area;
+        * :samp:`log_policies` dictionary of data_handlers.LogPolicy instances by history id,
+          deciding which samples are logged (every step for ids without a policy); the
+          line of sight trail shows logged 'los' samples, at most TRAIL_SEGMENTS of them
+          (see decimation.TrailDecimator);
+        * :samp:`keyframe_interval` number of steps between stored Players state keyframes;
+        * :samp:`profiler` an optional, already started, alloc_profiler.AllocationProfiler
+          instance measuring allocations of every loop phase (it is stopped when the loop
+          ends). Allocations are traced process wide: while profiling, keyboard events are
+          polled by the loop itself, outside profiled phases, so key_listener must not run
+          (and plots should run in a separate process).
+
+    Positions are drawn in meters through SimScreen viewport, which can be zoomed (+/-) and
+    panned (arrow keys) while the simulation runs; (f) toggles viewport follow mode.
+
+    Already simulated steps can be reviewed: (b/n) step back/forward, (w/e) rewind/forward by
+    SEEK_TIME seconds, (0-9) seek to a tenth of the run, (m) seek to maximum acceleration.
+    Reviewing suspends the simulation, (r) resumes it from where it was. A reviewed step is
+    shown restoring the nearest keyframe and replaying only the steps after it.
 
     """
-    def __init__(self, sscreen, plt_event, m0, t0, dt, rtf, tol, player_dim=(50,10)):
+    # missile state indices of logged guidance data
+    _GUIDANCE_LOGS = [(players.Player.STATE_SIZE + players.Missile.GUIDANCE_FIELDS.index(f), f)
+                      for f in ['los_rate', 'los_angle', 'closing_velocity']]
+    _EVERY_STEP = dh.LogPolicy('every', 1)
+    _NO_EVENTS = frozenset()
+    SEEK_TIME = 1.
+    TRAIL_SEGMENTS = 2000
+
+    def __init__(self, sscreen, plt_event, m0, t0, dt, rtf, tol, player_dim=(50,10),
+                 follow=False, log_policies=None, keyframe_interval=200, profiler=None):
         self._sscreen = sscreen
+        self._viewport = sscreen.viewport
+        self._viewport_version = None
+        self._trail = decimation.TrailDecimator(self.TRAIL_SEGMENTS)
+        self._trail_fed = 0
+        self.follow = follow
+        self.log_policies = dict(log_policies or {})
+        self.profiler = profiler
+        self._poll_events = profiler is not None
+        self.steps = 0
+        self._peak_acc = 0.
+        self._prev_range = None
+        self._closing = False
+        self._peak_step = 0
+        self._live = None
+        self._view_step = None
+        self._seek_request = None
         self._plt_event = plt_event
         self.dt = dt
         self.realtime_factor = rtf
@@ -103,6 +150,13 @@ The Simulator class
         self.resume_event  = threading.Event()
         self.resume_event.set()
 
+        # keyframe: Missile and Target states, history series lengths
+        self._history_ids = list(dh.history.keys())
+        self._timeline = dh.Timeline(keyframe_interval,
+                                     len(self.m['player'].state) + len(self.t['player'].state) +
+                                     len(self._history_ids))
+        self._keyframe()
+
 
     def loop(self):
         """
@@ -116,68 +170,87 @@ The Simulator class
             * if collision is detected exit the loop and quit the simulation;
             * sleep and repeat.
         """
+        prof = self.profiler
+        mark = prof.mark if prof is not None else lambda phase: None
+        end_step = prof.step if prof is not None else lambda: None
+
         while True:
+            mark('clear')
             self._sscreen.clear()
 
-            # pass target true coordinates to missile sensor layer and retrieve sensed values
-            # "corrupted" by sensors dynamics and noise
-            sensed = self.m['player'].sensors_layer.get_data(self.t['player'])
-
-            # update missile acceleration through sensed data
-            nacc   = self.m['player'].update_acc(sensed, self.dt)
-
-            # update Missile and Target navigation data and animation surface orientation
+            mark('physics')
+            self._step()
             for p in [self.m, self.t]:
-                p['player'].update_nav(self.dt)
                 p['surface'].update_ori(p['player'].ori)
 
-            if nacc:
-                self.m['player'].acc = nacc
-
-            # log and draw line of sight
-
-            dh.history['los'].append((
-                 viz.Point(self.pos2pix(self.m['player'].pos)), 
-                 viz.Point(self.pos2pix(self.t['player'].pos))
-            ))
-
-            for los in dh.history['los'][:-1]:
-                self._sscreen.draw_line('green', los[0], los[1])
-            self._sscreen.draw_line('red', dh.history['los'][-1][0], dh.history['los'][-1][1])
-
+            mark('logging')
+            self.steps += 1
+            collided = self.check_collision()
+            events = self._events(collided)
+
+            # log line of sight, acceleration and guidance data
+            missile = self.m['player']
+            self._log('los', events, missile.pos, self.t['player'].pos)
+            state = missile.state
+            if state[5]:
+                self._log('acc', events, state[5])
+            for index, los_d in self._GUIDANCE_LOGS:
+                # guidance data is nan until the guidance law first sets it
+                if state[index] == state[index]:
+                    self._log(los_d, events, state[index])
+            self._keyframe()
+
+            # draw line of sight: logged ones in green, current one in red
+            mark('drawing')
+            if self.follow:
+                self._viewport.follow([missile.pos, self.t['player'].pos])
+
+            redraw = not self._sscreen.dirty_rects
+            if self._viewport_version != self._viewport.version:
+                # viewport changed: every older line has to be drawn again
+                self._viewport_version = self._viewport.version
+                self._sscreen.reset()
+                redraw = True
+            # the trail keeps at most TRAIL_SEGMENTS of the logged lines, fed incrementally
+            logged = dh.history['los'][self._trail_fed:]
+            self._trail_fed += len(logged)
+            los = self._trail.extend(np.asarray(logged).reshape(-1, 4))
+            if redraw:
+                los = self._trail.data().reshape(-1, 4)
+            # otherwise older lines are kept on screen background, only new ones are drawn
+            self._sscreen.draw_segments('green', los[:, :2], los[:, 2:], persistent=True)
+            self._sscreen.draw_line('red', missile.pos, self.t['player'].pos)
 
             # place Missile and Target surfaces on screen
             for p in [self.m, self.t]:
-                self._sscreen.blit_center(p['surface'], 
-                                          self.pos2pix(p['player'].pos),
-                                          p['player'].ori)
-            if self.check_collision():
+                self._sscreen.blit_center(p['surface'], p['player'].pos)
+            if collided:
                 break
 
-            # log and plot
-            if self.m['player'].acc:
-                dh.history['acc'].append(round(self.m['player'].acc, 2))
-
-            for los_d in ['los_rate', 'los_angle', 'closing_velocity']:
-                if hasattr(self.m['player'], los_d):
-                    dh.history[los_d].append(round(getattr(self.m['player'], los_d), 5))
-
             # update plot with new data
+            mark('plotting')
             self._plt_event.emit(dh.history)
 
-            self._sscreen.display_text('> missile acceleration: ' + 
-                                       str(round(self.m['player'].acc, 2)))
+            mark('display')
+            self._sscreen.display_readout('> missile acceleration: ', self.m['player'].acc)
             self._sscreen.display_text('(s/r) to suspend/resume simulation', 1)
             self._sscreen.display_text('  (q) to quit simulation', 2)
             self._sscreen.update()
+            end_step()
+            if self._poll_events:
+                self._handle_events()
 
             time.sleep(self.dt/self.realtime_factor)
-            self.resume_event.wait()
+            self._suspended()
 
             if self.quit_event.is_set():
                 break
 
-        self.quit_event.wait()
+        if prof is not None:
+            prof.stop()
+
+        # simulation is over but its steps can still be reviewed
+        self._serve_seeks(self.quit_event)
         self._plt_event.emit({'quit': 'now'})
 
     def key_listener(self):
@@ -187,19 +260,135 @@ The Simulator class
         Listen to keyboard and ui events.
         """
         while not self.quit_event.is_set():
-            for event in self._sscreen.event.get():
-                if event.type == viz.event_type('QUIT'):
+            self._handle_events()
+            time.sleep(0.01)
+
+    def _handle_events(self):
+        for event in self._sscreen.event.get():
+            if event.type == viz.event_type('QUIT'):
+                self.quit_event.set()
+                self.resume_event.set()
+            if event.type == viz.event_type('KEYDOWN'):
+                if event.key == viz.event_key('s'):
+                    self.resume_event.clear()
+                if event.key == viz.event_key('r'):
+                    self.resume_event.set()
+                if event.key == viz.event_key('q'):
                     self.quit_event.set()
                     self.resume_event.set()
-                if event.type == viz.event_type('KEYDOWN'):
-                    if event.key == viz.event_key('s'):
-                        self.resume_event.clear()
-                    if event.key == viz.event_key('r'):
-                        self.resume_event.set()
-                    if event.key == viz.event_key('q'):
-                        self.quit_event.set()
-                        self.resume_event.set()
-            time.sleep(0.01)
+                if event.key == viz.event_key('f'):
+                    self.follow = not self.follow
+                self._viewport_key(event.key)
+                self._seek_key(event.key)
+
+    def _step(self):
+        # pass target true coordinates to missile sensor layer and retrieve sensed values
+        # "corrupted" by sensors dynamics and noise
+        sensed = self.m['player'].sensors_layer.get_data(self.t['player'])
+
+        # update missile acceleration through sensed data
+        nacc   = self.m['player'].update_acc(sensed, self.dt)
+
+        # update Missile and Target navigation data
+        for p in [self.m, self.t]:
+            p['player'].update_nav(self.dt)
+
+        if nacc:
+            self.m['player'].acc = nacc
+
+    def _keyframe(self):
+        # only keyframe steps are stored: do not build history lengths on every step
+        if self.steps % self._timeline.interval:
+            return
+        self._timeline.store(self.steps, self.m['player'].state, self.t['player'].state,
+                             [len(dh.history[mid]) for mid in self._history_ids])
+
+    def _serve_seeks(self, event):
+        # reviewed steps are drawn here, inside simulation thread, until event is set
+        while not event.wait(0.01):
+            if self._poll_events:
+                self._handle_events()
+            step, self._seek_request = self._seek_request, None
+            if step is not None:
+                self._show_step(step)
+
+    def _suspended(self):
+        self._serve_seeks(self.resume_event)
+        if self._live is not None:
+            # back to live simulation: restore Players and redraw everything
+            self.m['player'].restore(self._live[0])
+            self.t['player'].restore(self._live[1])
+            for p in [self.m, self.t]:
+                p['surface'].update_ori(p['player'].ori)
+            self._live = self._view_step = None
+            self._viewport_version = None
+
+    def _show_step(self, step):
+        missile, target = self.m['player'], self.t['player']
+        if self._live is None:
+            self._live = (missile.snapshot(), target.snapshot())
+        self._view_step = step
+
+        # restore nearest keyframe and replay forward
+        kstep, frame = self._timeline.keyframe(step)
+        msize = len(missile.state)
+        missile.restore(frame[:msize])
+        target.restore(frame[msize:msize + len(target.state)])
+        los = [np.hstack([missile.pos, target.pos])]
+        for _ in range(step - kstep):
+            self._step()
+            los.append(np.hstack([missile.pos, target.pos]))
+        los_logged = int(frame[msize + len(target.state) + self._history_ids.index('los')])
+
+        self._sscreen.reset()
+        trail = np.vstack([self._trail.data(los_logged).reshape(-1, 4)] + los)
+        self._sscreen.draw_segments('green', trail[:-1, :2], trail[:-1, 2:])
+        self._sscreen.draw_line('red', missile.pos, target.pos)
+        for p in [self.m, self.t]:
+            p['surface'].update_ori(p['player'].ori)
+            self._sscreen.blit_center(p['surface'], p['player'].pos)
+        self._sscreen.display_readout('> missile acceleration: ', missile.acc)
+        self._sscreen.display_readout('> reviewing t = ', step * self.dt, 1)
+        self._sscreen.display_text('  (r) to resume simulation', 2)
+        self._sscreen.update()
+
+    def _seek_key(self, key):
+        current = self.steps if self._view_step is None else self._view_step
+        seek_steps = int(round(self.SEEK_TIME / self.dt))
+        targets = {'b': current - 1, 'n': current + 1, 'w': current - seek_steps,
+                   'e': current + seek_steps, 'm': self._peak_step}
+        targets.update({str(d): self.steps * d // 10 for d in range(10)})
+        for name, step in targets.items():
+            if key == viz.event_key(name):
+                self.resume_event.clear()
+                self._seek_request = min(max(step, 0), self.steps)
+
+    def _events(self, collided):
+        missile, target = self.m['player'], self.t['player']
+        events = None
+        if self.steps == 1:
+            events = {'launch'}
+        acc = abs(missile.acc)
+        if acc > self._peak_acc:
+            self._peak_acc = acc
+            self._peak_step = self.steps
+            events = (events or set()) | {'max_g'}
+        rng = np.hypot(target.pos[0] - missile.pos[0], target.pos[1] - missile.pos[1])
+        if self._prev_range is not None:
+            closing = rng < self._prev_range
+            if self._closing and not closing:
+                events = (events or set()) | {'cpa'}
+            self._closing = closing
+        self._prev_range = rng
+        if collided:
+            events = (events or set()) | {'intercept'}
+        return events or self._NO_EVENTS
+
+    def _log(self, mid, events, *parts):
+        series = dh.history[mid]
+        if self.log_policies.get(mid, self._EVERY_STEP).accept(self.steps, events, series,
+                                                               *parts):
+            series.write(*parts)
 
     def check_collision(self):
         """
@@ -212,38 +401,23 @@ The Simulator class
                 self.m['player'].pos[1] > self.t['player'].pos[1] - self.tolerance and 
                 self.m['player'].pos[1] < self.t['player'].pos[1] + self.tolerance)
 
-    def pos2pix(self, pos):
-        """
-.. method:: pos2pix(pos)
-
-        Conver a position tuple expressed in meters to a pixels tuple.
-        """
-        return tuple([int(uc.meters_to_pix(ppos)) for ppos in pos])
-
-
-parser = argparse.ArgumentParser(description='Simulator and plotter.')
-parser.add_argument('-mp', '--missilepos', dest='m0pos', nargs=2, type=int,
-                    metavar=('x','y'), help='missile start position', default=(10,5))
-parser.add_argument('-mv', '--missilevel', dest='m0vel', type=int,
-                    metavar='vel', help='missile start velocity', default=40)
-parser.add_argument('-mhe', '--missilehe', dest='m0he', type=int,
-                    metavar='HE (degrees)', help='missile heading error', default=-20)
-parser.add_argument('-mg', '--missileguidance', dest='missile_guidance', type=str,
-                    metavar='guidance', help='chosen guidance (ppn/apng)', default='ppn')
-parser.add_argument('-mgg', '--mguidancegain', dest='missile_guidance_gain', type=int,
-                    metavar='guidance', help='chosen guidance gain', default=3)
+    def _viewport_key(self, key):
+        width = self._viewport.visible()[1][0] - self._viewport.visible()[0][0]
+        # '+' is shifted '=' on most layouts
+        if key in (viz.event_key('PLUS'), viz.event_key('EQUALS'), viz.event_key('KP_PLUS')):
+            self._viewport.zoom_by(1.25)
+        elif key in (viz.event_key('MINUS'), viz.event_key('KP_MINUS')):
+            self._viewport.zoom_by(0.8)
+        elif key == viz.event_key('LEFT'):
+            self._viewport.pan(-width / 10, 0)
+        elif key == viz.event_key('RIGHT'):
+            self._viewport.pan(width / 10, 0)
+        elif key == viz.event_key('UP'):
+            self._viewport.pan(0, width / 10)
+        elif key == viz.event_key('DOWN'):
+            self._viewport.pan(0, -width / 10)
 
 
-parser.add_argument('-tp', '--targetpos', dest='t0pos', nargs=2, type=int,
-                    metavar=('x','y'), help='target start position', default=(50,30))
-parser.add_argument('-tv', '--targetvel', dest='t0vel', type=int,
-                    metavar='vel', help='target start velocity', default=5)
-parser.add_argument('-ta', '--targetacc', dest='t0acc', type=int,
-                    metavar='acceleration', help='target acceleration', default=0)
-
-# parse command line arguments
-args = parser.parse_args()
-
 # since simulator loop runs on a separate thread from Plotter qt app, plt_update_fn is written
 # to be called every time a plt_event is emitted inside simulator loop (see dh.Plotter docs)
 def plt_update_fn(self, history):
@@ -254,36 +428,125 @@ def plt_update_fn(self, history):
     for plt_id in self.plots():
         self.set_data(plt_id, history[plt_id])
 
-# prepare plots
-data_ids = ['acc', 'los_rate', 'los_angle', 'los', 'closing_velocity']
-plt = dh.Plotter('Data Plotting', (800,800), plt_update_fn)
-plt.add_plots([[data_ids[0], 'Missile Acceleration Plot', ['y']],
-               [data_ids[1], 'Los Rate Plot', ['y']],
-               'next_row',
-               [data_ids[2], 'Los Angle Plot', ['y']],
-               [data_ids[4], 'Closing Velocity Plot', ['y']]])
-
-# prepare logging slots
-dh.make_history(data_ids)
-
-m0 = {
-    'guidance': getattr(png, args.missile_guidance),
-    'guidance_gain': args.missile_guidance_gain,
-    'pos': args.m0pos,
-    'vel': args.m0vel,
-    'he':  args.m0he
-}
-
-t0 = {
-    'pos': args.t0pos,
-    'vel': args.t0vel,
-    'acc': args.t0acc
-}
-
-sscreen = viz.SimScreen((800, 600), 15)
-simulator = Simulator(sscreen, plt.pc.plot_event, m0, t0, dt = 0.005, rtf = 0.5, tol = 0.5)
-
-threading.Thread(target=simulator.key_listener).start()
-threading.Thread(target=simulator.loop).start()
-# plotter object must run inside main thread
-plt.run()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulator and plotter.')
+    parser.add_argument('-mp', '--missilepos', dest='m0pos', nargs=2, type=int,
+                        metavar=('x','y'), help='missile start position', default=(10,5))
+    parser.add_argument('-mv', '--missilevel', dest='m0vel', type=int,
+                        metavar='vel', help='missile start velocity', default=40)
+    parser.add_argument('-mhe', '--missilehe', dest='m0he', type=int,
+                        metavar='HE (degrees)', help='missile heading error', default=-20)
+    parser.add_argument('-mg', '--missileguidance', dest='missile_guidance', type=str,
+                        metavar='guidance', help='chosen guidance (ppn/apng)', default='ppn')
+    parser.add_argument('-mgg', '--mguidancegain', dest='missile_guidance_gain', type=int,
+                        metavar='guidance', help='chosen guidance gain', default=3)
+
+
+    parser.add_argument('-tp', '--targetpos', dest='t0pos', nargs=2, type=int,
+                        metavar=('x','y'), help='target start position', default=(50,30))
+    parser.add_argument('-tv', '--targetvel', dest='t0vel', type=int,
+                        metavar='vel', help='target start velocity', default=5)
+    parser.add_argument('-ta', '--targetacc', dest='t0acc', type=int,
+                        metavar='acceleration', help='target acceleration', default=0)
+
+    parser.add_argument('-dr', '--dirtyrects', dest='dirty_rects', action='store_true',
+                        help='only redraw changed screen regions')
+    parser.add_argument('-f', '--follow', dest='follow', action='store_true',
+                        help='keep missile and target inside the view')
+    parser.add_argument('-hw', '--historywindow', dest='history_window', type=int,
+                        metavar='samples', help='history samples kept in memory, older ones are '
+                        'spilled to disk (default: keep everything in memory)', default=None)
+    parser.add_argument('-lp', '--logpolicy', dest='log_policies', nargs=3, action='append',
+                        metavar=('id', 'kind', 'value'), default=[],
+                        help='history logging policy of a series: every k / change threshold / '
+                        'events launch,max_g,cpa,intercept / off 0 (default: every 1)')
+    parser.add_argument('-ap', '--allocprofile', dest='alloc_profile', type=str, default=None,
+                        metavar='path', help='profile step loop allocations and write a JSON '
+                        'report to path (implies --plotprocess; allocations are traced process '
+                        'wide, keyboard is polled by the simulation thread meanwhile)')
+    parser.add_argument('-aw', '--allocwindow', dest='alloc_window', type=int, default=1000,
+                        metavar='steps', help='steps between retained memory snapshots')
+    parser.add_argument('-pp', '--plotprocess', dest='plot_process', action='store_true',
+                        help='run plots in a separate process fed through shared memory')
+    parser.add_argument('-pc', '--plotcapacity', dest='plot_capacity', type=int, default=5000,
+                        metavar='samples', help='most recent samples shown by --plotprocess plots')
+
+    # parse command line arguments
+    args = parser.parse_args()
+    if args.alloc_profile is not None:
+        # no Qt app in this process: allocations traced during profiling are the simulator ones
+        args.plot_process = True
+
+    # prepare plots
+    data_ids = ['acc', 'los_rate', 'los_angle', 'los', 'closing_velocity']
+    plots = [[data_ids[0], 'Missile Acceleration Plot', ['y']],
+             [data_ids[1], 'Los Rate Plot', ['y']],
+             'next_row',
+             [data_ids[2], 'Los Angle Plot', ['y']],
+             [data_ids[4], 'Closing Velocity Plot', ['y']]]
+
+    # history logging policies, checked before any window is opened
+    log_policies = {}
+    for mid, kind, value in args.log_policies:
+        if mid not in data_ids:
+            parser.error('unknown log policy id %s (one of %s)' % (mid, ', '.join(data_ids)))
+        try:
+            value = {'every': int, 'change': float, 'events': lambda v: v.split(',')}.get(
+                kind, lambda v: v)(value)
+            log_policies[mid] = dh.LogPolicy(kind, value)
+        except ValueError as error:
+            parser.error('invalid log policy for %s: %s' % (mid, error))
+
+    if args.plot_process:
+        # simulator only writes samples to shared memory, plotter process redraws on its own
+        ring = dh.SharedRing([p[0] for p in plots if p != 'next_row'],
+                             args.plot_capacity)
+        plt_proc = dh.start_plotter_process(ring, 'Data Plotting', (800,800), plots)
+        plt_event = ring
+    else:
+        plt = dh.Plotter('Data Plotting', (800,800), plt_update_fn)
+        plt.add_plots(plots)
+        plt_event = plt.pc.plot_event
+
+    # prepare logging slots
+    dh.make_history(data_ids, args.history_window, widths={'los': 4})
+
+    m0 = {
+        'guidance': getattr(png, args.missile_guidance),
+        'guidance_gain': args.missile_guidance_gain,
+        'pos': args.m0pos,
+        'vel': args.m0vel,
+        'he':  args.m0he
+    }
+
+    t0 = {
+        'pos': args.t0pos,
+        'vel': args.t0vel,
+        'acc': args.t0acc
+    }
+
+    profiler = None
+    if args.alloc_profile is not None:
+        profiler = alloc_profiler.AllocationProfiler(args.alloc_window)
+        profiler.start()
+
+    sscreen = viz.SimScreen((800, 600), 15, args.dirty_rects,
+                            viz.Viewport((800, 600), uc.meters_to_pix(1)))
+    simulator = Simulator(sscreen, plt_event, m0, t0, dt = 0.005, rtf = 0.5, tol = 0.5,
+                          follow = args.follow, log_policies = log_policies, profiler = profiler)
+
+    if profiler is None:
+        threading.Thread(target=simulator.key_listener).start()
+    sim_thread = threading.Thread(target=simulator.loop)
+    sim_thread.start()
+    if args.plot_process:
+        sim_thread.join()
+        plt_proc.join()
+        ring.close()
+    else:
+        # plotter object must run inside main thread
+        plt.run()
+    if profiler is not None:
+        sim_thread.join()
+        profiler.dump(args.alloc_profile)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 11:30:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 11:30:00
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aggregators
+
+
+def _results(count, p=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        hit = bool(rng.random() < p)
+        yield {'hit': hit, 'miss_distance': rng.exponential(5.), 'time_of_flight': 2 + rng.random(),
+               'peak_acc': rng.normal(40, 5), 'integrated_acc': rng.normal(60, 10)}
+
+
+def test_running_stats_merge():
+    samples = np.random.default_rng(1).normal(3., 2., 1000)
+    parts = [aggregators.RunningStats() for _ in range(3)]
+    for part, chunk in zip(parts, np.split(samples, [100, 101])):
+        for x in chunk:
+            part.add(x)
+    merged = aggregators.RunningStats()
+    for part in parts:
+        merged.merge(part)
+    merged.merge(aggregators.RunningStats())
+    assert merged.n == 1000
+    assert merged.mean == pytest.approx(samples.mean(), rel=1e-12)
+    assert merged.variance() == pytest.approx(samples.var(ddof=1), rel=1e-12)
+    assert (merged.min, merged.max) == (samples.min(), samples.max())
+
+
+def test_histogram_merge():
+    samples = np.random.default_rng(2).normal(0., 1., 500)
+    a, b = aggregators.Histogram(-2, 2, 8), aggregators.Histogram(-2, 2, 8)
+    for x in samples[:200]:
+        a.add(x)
+    for x in samples[200:]:
+        b.add(x)
+    a.merge(b)
+    assert a.counts.tolist() == np.histogram(samples, a.edges)[0].tolist()
+    assert a.underflow == np.sum(samples < -2) and a.overflow == np.sum(samples >= 2)
+    with pytest.raises(ValueError):
+        a.merge(aggregators.Histogram(-2, 2, 4))
+
+
+def test_quantile_sketch_accuracy():
+    samples = np.random.default_rng(3).lognormal(0., 1., 20000)
+    sketches = [aggregators.QuantileSketch(100) for _ in range(4)]
+    for sketch, chunk in zip(sketches, np.split(samples, 4)):
+        for x in chunk:
+            sketch.add(x)
+    for sketch in sketches[1:]:
+        sketches[0].merge(sketch)
+    q = np.array([0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99])
+    # accuracy measured as rank error, the sketch keeps tails at finer resolution
+    ranks = np.searchsorted(np.sort(samples), sketches[0].quantile(q)) / len(samples)
+    assert np.all(np.abs(ranks - q) < 0.005)
+    assert np.all(np.abs(ranks - q)[[0, -1]] < 0.001)
+
+
+def test_wilson_interval_early_stop():
+    consumed = []
+
+    def results():
+        for result in _results(100000):
+            consumed.append(result)
+            yield result
+
+    summaries = []
+    mca = aggregators.aggregate(results(), check_every=50, progress_fn=summaries.append,
+                                hit_halfwidth=0.02)
+    lo, hi = mca.hit_probability()[1]
+    assert (hi - lo) / 2 <= 0.02
+    assert mca.n == len(consumed) and mca.n % 50 == 0
+    # previous check had not converged yet
+    previous = summaries[-2]['hit_probability_ci']
+    assert (previous[1] - previous[0]) / 2 > 0.02
+    assert [s['runs'] for s in summaries] == list(range(50, mca.n + 1, 50))
+    assert mca.hit_probability()[0] == pytest.approx(0.3, abs=0.03)
+
+
+def test_aggregate_merges_partial_aggregators():
+    results = list(_results(300))
+    partials = [aggregators.aggregate(results[i:i + 100]) for i in range(0, 300, 100)]
+    merged = aggregators.aggregate(partials)
+    direct = aggregators.aggregate(results)
+    assert (merged.n, merged.hits) == (direct.n, direct.hits)
+    assert merged.miss_histogram.counts.tolist() == direct.miss_histogram.counts.tolist()
+    assert merged.stats['peak_acc'].mean == pytest.approx(direct.stats['peak_acc'].mean)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 12:10:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 12:10:00
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runner
+import batch_runner
+
+
+def _rows(path):
+    with open(path) as fin:
+        return [json.loads(line) for line in fin]
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(batch_runner.RecordError):
+        batch_runner.to_scenario({'id': 'd', 'he': -30})
+    with pytest.raises(batch_runner.RecordError):
+        batch_runner.to_scenario({'id': 'd', 'm0.pos.2': 1})
+    with pytest.raises(batch_runner.RecordError):
+        batch_runner.to_scenario({'id': 'd', 'm0': {'heading': 3}})
+    rid, scenario = batch_runner.to_scenario({'id': 7, 'm0_he': -30, 't0.pos.1': 12, 'dt': 0.01})
+    assert rid == '7'
+    assert scenario == runner.make_scenario({'he': -30}, {'pos': [50, 12]}, dt=0.01)
+
+
+def test_bad_records_become_error_rows(tmp_path):
+    source, output = str(tmp_path / 'scenarios.jsonl'), str(tmp_path / 'results.jsonl')
+    with open(source, 'w') as fout:
+        fout.write('{"id": "a", "max_time": 0.1}\n{"id": "b", "he": -30}\n{"id": \n'
+                   '{"id": "c", "guidance": "nope"}\n')
+    assert batch_runner.run_file(source, output, processes=1) == 4
+    rows = {row['id']: row for row in _rows(output)}
+    assert 'error' not in rows['a']
+    assert 'unknown record fields: he' in rows['b']['error']
+    assert 'malformed' in rows['3']['error']
+    assert 'nope' in rows['c']['error']
+
+    # failed records are not indexed, so they are retried
+    assert batch_runner.completed_ids(output + '.index') == {'a'}
+    assert batch_runner.run_file(source, output, processes=1) == 3
+    assert len(_rows(output)) == 7
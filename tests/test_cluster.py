@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 12:20:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 12:20:00
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runner
+import cluster
+
+SCENARIOS = [runner.make_scenario(t0={'vel': v}, max_time=0.5) for v in range(6)]
+
+
+def test_local_workers_complete_sweep(tmp_path):
+    coordinator = cluster.Coordinator(SCENARIOS, chunk_size=2,
+                                      journal=str(tmp_path / 'journal.jsonl'))
+    address = coordinator.start()
+    assert address[0] == '127.0.0.1'
+    procs = cluster.launch_local_workers(address, coordinator.authkey, 2)
+    try:
+        results = coordinator.wait(0.05)
+    finally:
+        coordinator.shutdown()
+        for proc in procs:
+            proc.join(10)
+    assert results == [runner.run_scenario(s) for s in SCENARIOS]
+    assert coordinator.dispatcher.failed == []
+
+
+def test_expired_leases_are_retried(tmp_path):
+    journal = str(tmp_path / 'journal.jsonl')
+    dispatcher = cluster.Dispatcher(SCENARIOS, 3, lease_timeout=0.05, max_retries=1,
+                                    journal=journal)
+    first = dispatcher.lease('a')
+    second = dispatcher.lease('a')
+    assert (first['chunk'], second['chunk']) == (0, 1)
+    assert dispatcher.lease('a')['status'] == 'wait'
+
+    # a lost worker: its chunk is leased again once, then given up
+    time.sleep(0.1)
+    assert not dispatcher.heartbeat(0)
+    assert dispatcher.lease('b')['chunk'] == 0
+    assert dispatcher.lease('b')['chunk'] == 1
+    time.sleep(0.1)
+    assert dispatcher.finished()
+    assert dispatcher.failed == [0, 1]
+
+    # late results are still accepted and journaled
+    results = [runner.run_scenario(s) for s in SCENARIOS[:3]]
+    dispatcher.complete(0, results)
+    assert dispatcher.failed == [1]
+    assert dispatcher.progress() == (3, 6)
+
+    # resuming from the journal only runs missing chunks
+    resumed = cluster.Dispatcher(SCENARIOS, 3, lease_timeout=10, journal=journal)
+    task = resumed.lease('c')
+    assert task['chunk'] == 1 and task['scenarios'] == SCENARIOS[3:]
+    assert resumed.lease('c')['status'] == 'wait'
+    assert resumed.results()[:3] == results
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 10:30:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 10:30:00
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_handlers as dh
+
+
+def _spilled(count, hot_size=10, width=None):
+    series = dh.SpillingSeries(hot_size)
+    for i in range(count):
+        series.append(float(i) if width is None else tuple(float(i + k) for k in range(width)))
+    return series
+
+
+def test_spilling_series_bounds_memory():
+    series = _spilled(1000)
+    assert len(series) == 1000
+    assert len(series._hot) < 20
+    assert list(series) == [float(i) for i in range(1000)]
+    series.close()
+
+
+def test_spilling_series_indexing_across_hot_and_cold():
+    series = _spilled(95, width=2)
+    cold = series._cold
+    for i in [0, 9, 10, cold - 1, cold, 94, -1, -95]:
+        assert series[i] == (float(i % 95), float(i % 95 + 1))
+    with pytest.raises(IndexError):
+        series[95]
+
+
+def test_spilling_series_slices_are_arrays():
+    series = _spilled(95)
+    cold = series._cold
+    for sl in [slice(0, 5), slice(cold - 3, cold + 3), slice(cold + 1, None), slice(90, 90),
+               slice(3, 60, 7), slice(None, None, -1)]:
+        part = series[sl]
+        assert isinstance(part, np.ndarray)
+        assert part.tolist() == [float(i) for i in range(95)][sl]
+    assert series[cold:].shape == (95 - cold,)
+    assert _spilled(35, width=4)[30:].shape == (5, 4)
+    assert _spilled(35, width=4)[40:].shape == (0, 4)
+
+
+def test_spilling_series_slices_read_covered_chunks_only(monkeypatch):
+    series = _spilled(1000)
+    read = []
+    chunk = series._chunk
+    monkeypatch.setattr(series, '_chunk', lambda index: read.append(index) or chunk(index))
+    assert series[995:].tolist() == [float(i) for i in range(995, 1000)]
+    assert read == []
+    assert series[55:65].tolist() == [float(i) for i in range(55, 65)]
+    assert sorted(set(read)) == [5, 6]
+
+
+def test_spilling_series_array():
+    series = _spilled(47, width=3)
+    data = np.asarray(series)
+    assert data.shape == (47, 3)
+    assert np.array_equal(data[:, 0], np.arange(47))
+    assert np.asarray(dh.SpillingSeries(10)).shape == (0,)
+
+
+def test_shared_ring_offsets_after_wrap():
+    ring = dh.SharedRing(['a'], 4)
+    history = {'a': []}
+    history['a'].extend([0., 1., 2.])
+    ring.emit(history)
+    snapshot, offsets = ring.read(offsets=True)
+    assert snapshot['a'].tolist() == [0., 1., 2.] and offsets['a'] == 0
+    history['a'].extend([3., 4., 5., 6.])
+    ring.emit(history)
+    snapshot, offsets = ring.read(offsets=True)
+    assert snapshot['a'].tolist() == [3., 4., 5., 6.] and offsets['a'] == 3
+    assert ring.read()['a'].tolist() == [3., 4., 5., 6.]
+    ring.close()
+
+
+def test_spilling_series_concurrent_reads():
+    series = dh.SpillingSeries(16)
+    count = 20000
+    errors = []
+
+    def read():
+        rng = np.random.default_rng(0)
+        while len(series) < count:
+            n = len(series)
+            if n < 2:
+                continue
+            start = int(rng.integers(0, n - 1))
+            part = series[start:n]
+            if not np.array_equal(part, np.arange(start, n, dtype=float)):
+                errors.append(start)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(count):
+        series.append(float(i))
+    reader.join()
+    assert not errors
+    assert np.array_equal(np.asarray(series), np.arange(count, dtype=float))
+    series.close()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 10:00:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 10:00:00
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import decimation
+
+
+def test_trail_is_bounded():
+    trail = decimation.TrailDecimator(2000)
+    rows = np.arange(12000 * 4, dtype=float).reshape(-1, 4)
+    for i in range(len(rows)):
+        trail.extend(rows[i:i + 1])
+    data = trail.data()
+    assert len(data) <= 2001
+    assert np.array_equal(data[0], rows[0])
+    assert np.array_equal(data[-1], rows[-1])
+    # kept items are evenly spaced
+    assert len(set(np.diff(data[:-1, 0]))) == 1
+
+
+def test_trail_extend_returns_kept_items():
+    trail = decimation.TrailDecimator(4)
+    kept = [trail.extend(np.full((1, 4), i)) for i in range(10)]
+    drawn = np.vstack([k for k in kept if len(k)])
+    assert set(trail.data()[:-1, 0]) <= set(drawn[:, 0])
+    assert len(trail.data(5)) == len([i for i in range(5) if i % trail.stride == 0])
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 12:00:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 12:00:00
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runner
+import envelope
+import batch_engine
+import results_cache
+
+
+def test_batch_results_are_not_served_to_reference_sweeps(tmp_path):
+    # a scenario on which the batch engine diverges from the reference one
+    scenario = runner.make_scenario({'guidance_gain': 2, 'he': -45}, {'vel': 10}, max_time=10)
+    cache = results_cache.ResultCache(str(tmp_path))
+    batch = envelope.evaluate_default([scenario], cache=cache)[0]
+    assert batch == batch_engine.run_batch([scenario])[0]
+    assert cache.get(scenario) is None
+    assert cache.get(scenario, engine='batch') == batch
+
+    reference = runner.run_sweep([scenario], 1, cache)[0]
+    assert reference == runner.run_scenario(scenario)
+    assert envelope.evaluate_default([scenario], cache=cache)[0] == batch
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-19 21:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-19 21:40:00
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import golden
+import batch_engine
+
+
+def _failures(reports):
+    return {name: report for name, report in reports.items() if not report['ok']}
+
+
+def test_corpus_stored():
+    assert set(golden.load()) == set(golden.CORPUS)
+
+
+def test_reference_matches_golden():
+    assert _failures(golden.check(golden.reference)) == {}
+
+
+def test_batch_engine_matches_golden():
+    assert _failures(golden.check(lambda s: batch_engine.run_batch(s, trajectory=True))) == {}
+
+
+def test_divergence_is_reported():
+    ref = golden.load()['default_ppn']
+    cand = {m: ref[m] for m in golden.METRICS}
+    cand['trajectory'] = {k: v.copy() for k, v in ref['trajectory'].items()}
+    cand['trajectory']['acc'][100:] += 1e-3
+    report = golden.compare(ref, cand)
+    assert not report['ok']
+    assert report['acc']['first_divergence'] == pytest.approx(ref['trajectory']['t'][100])
+    assert report['acc']['max_error'] == pytest.approx(1e-3)
+    assert report['missile']['first_divergence'] is None
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 13:00:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 13:00:00
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import png
+import runner
+import results_cache
+
+
+def _result(value):
+    return {'hit': True, 'miss_distance': value, 'time_of_flight': 1., 'peak_acc': 2.,
+            'integrated_acc': 3., 'steps': 200}
+
+
+def test_key_canonicalisation():
+    key = results_cache.scenario_key(runner.make_scenario())
+    assert results_cache.scenario_key({}) == key
+    assert results_cache.scenario_key({'m0': {'guidance_gain': 3.0, 'pos': [10., 5]}}) == key
+    assert results_cache.scenario_key({'m0': {'guidance': png.ppn}}) == key
+    assert results_cache.scenario_key({'dt': 0.0050}) == key
+    assert results_cache.scenario_key({'m0': {'guidance_gain': 4}}) != key
+    assert results_cache.scenario_key({'m0': {'guidance': 'apng'}}) != key
+    assert results_cache.scenario_key({}, engine='batch') != key
+
+
+def test_lru_eviction(tmp_path):
+    cache = results_cache.ResultCache(str(tmp_path))
+    scenarios = [runner.make_scenario(t0={'vel': v}) for v in range(4)]
+    for i, scenario in enumerate(scenarios[:3]):
+        cache.put(scenario, _result(i))
+        # distinct, increasing access times
+        key = results_cache.scenario_key(scenario)
+        os.utime(os.path.join(cache.path, key + '.json'), (1000 + i, 1000 + i))
+    size = sum(os.path.getsize(os.path.join(cache.path, f)) for f in os.listdir(cache.path))
+
+    # reading the oldest entry makes it the most recently used one
+    assert cache.get(scenarios[0]) == _result(0)
+    cache.max_bytes = size
+    cache.put(scenarios[3], _result(3))
+    assert cache.get(scenarios[1]) is None
+    assert [cache.get(scenarios[i]) for i in (0, 2, 3)] == [_result(0), _result(2), _result(3)]
+
+
+def test_trajectory_miss(tmp_path):
+    cache = results_cache.ResultCache(str(tmp_path))
+    scenario = runner.make_scenario(max_time=1)
+    cache.put(scenario, _result(1.))
+    assert cache.get(scenario) == _result(1.)
+    assert cache.get(scenario, trajectory=True) is None
+
+    result = runner.run_scenario(scenario, trajectory=True)
+    cache.put(scenario, result)
+    cached = cache.get(scenario, trajectory=True)
+    assert np.array_equal(cached['trajectory']['missile'], result['trajectory']['missile'])
+    cache.clear()
+    assert cache.get(scenario) is None
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 13:10:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 13:10:00
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runner
+import results_cache
+
+SCENARIOS = [runner.make_scenario(t0={'vel': v}, max_time=2) for v in (0, 5, 10)]
+
+
+def test_make_scenario_defaults():
+    scenario = runner.make_scenario({'he': 10}, {'acc': 1}, dt=0.01)
+    assert scenario['m0']['he'] == 10 and scenario['m0']['vel'] == 40
+    assert scenario['t0']['acc'] == 1 and scenario['dt'] == 0.01
+    assert runner.DEFAULT_SCENARIO['m0']['he'] == -20
+
+
+def test_run_scenario_result():
+    result = runner.run_scenario(runner.make_scenario(), trajectory=True)
+    assert result['hit']
+    assert result['miss_distance'] <= runner.DEFAULT_SCENARIO['tol'] * 2 ** 0.5
+    assert result['steps'] == len(result['trajectory']['t'])
+    assert result['time_of_flight'] == result['steps'] * runner.DEFAULT_SCENARIO['dt']
+    # runs are deterministic
+    del result['trajectory']
+    assert result == runner.run_scenario(runner.make_scenario())
+
+
+def test_run_sweep_order_and_cache(tmp_path):
+    expected = [runner.run_scenario(s) for s in SCENARIOS]
+    assert runner.run_sweep(SCENARIOS, processes=2) == expected
+
+    cache = results_cache.ResultCache(str(tmp_path))
+    assert runner.run_sweep(SCENARIOS, 1, cache) == expected
+    # cached results are returned without running scenarios again
+    cache.put(SCENARIOS[1], dict(expected[1], steps=-1))
+    assert runner.run_sweep(SCENARIOS, 1, cache)[1]['steps'] == -1
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 12:40:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 12:40:00
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runner
+import shared_results
+
+SCENARIOS = [runner.make_scenario(t0={'vel': v}, max_time=2) for v in (0, 5, 10)]
+
+
+def _blocks():
+    if not os.path.isdir(shared_results.SHM_DIR):
+        return set()
+    return set(os.listdir(shared_results.SHM_DIR))
+
+
+def test_shared_sweep_matches_run_scenario():
+    with shared_results.run_sweep_shared(SCENARIOS, processes=2, max_steps=300) as shr:
+        for i, scenario in enumerate(SCENARIOS):
+            expected = runner.run_scenario(scenario, trajectory=True)
+            result = shr.result(i)
+            steps = min(expected['steps'], 300)
+            assert {k: result[k] for k in shared_results.RESULT_FIELDS} == \
+                {k: expected[k] for k in shared_results.RESULT_FIELDS}
+            assert np.array_equal(result['trajectory']['missile'],
+                                  expected['trajectory']['missile'][:steps])
+
+
+def test_shared_sweep_releases_memory_on_errors():
+    before = _blocks()
+    bad = SCENARIOS + [runner.make_scenario({'guidance': 'nope'})]
+    with pytest.raises(AttributeError):
+        shared_results.run_sweep_shared(bad, processes=2, max_steps=300)
+    assert _blocks() == before
+
+
+def test_shared_sweep_checks_budget():
+    before = _blocks()
+    needed = shared_results.SharedResults.nbytes(len(SCENARIOS), 400)
+    with pytest.raises(MemoryError):
+        shared_results.run_sweep_shared(SCENARIOS, max_steps=400, max_bytes=needed - 1)
+    assert _blocks() == before
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 11:00:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 11:00:00
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import png
+import sim as simulation
+import visualizer as viz
+import data_handlers as dh
+import unit_converter as uc
+
+
+M0 = {'guidance': png.ppn, 'guidance_gain': 3, 'pos': (10, 5), 'vel': 40, 'he': -20}
+T0 = {'pos': (50, 30), 'vel': 5, 'acc': 0}
+
+
+class _Events:
+
+    def __init__(self):
+        self.states = {}
+
+    def emit(self, history):
+        # live Players states, by step
+        sim = self.simulator
+        self.states[sim.steps] = (sim.m['player'].snapshot(), sim.t['player'].snapshot())
+
+
+def _simulator(**kwargs):
+    dh.make_history(['acc', 'los_rate', 'los_angle', 'los', 'closing_velocity'],
+                    widths={'los': 4})
+    sscreen = viz.SimScreen((800, 600), 15, viewport=viz.Viewport((800, 600),
+                                                                  uc.meters_to_pix(1)))
+    events = _Events()
+    sim = events.simulator = simulation.Simulator(sscreen, events, M0, T0, dt=0.005, rtf=1e9,
+                                                  tol=0.5, **kwargs)
+    # run the loop up to the intercept without waiting for keyboard events
+    sim._serve_seeks = lambda event: None
+    return sim
+
+
+def test_series_buffer_grows():
+    series = dh.SeriesBuffer(3, capacity=2)
+    for i in range(5):
+        series.write(float(i), np.array([i + 1., i + 2.]))
+    assert len(series) == 5
+    assert len(series._data) == 8
+    assert series[-1].tolist() == [4., 5., 6.]
+    assert np.asarray(series)[:, 0].tolist() == [0., 1., 2., 3., 4.]
+    assert series[1:3].shape == (2, 3)
+    with pytest.raises(IndexError):
+        series[5]
+
+
+def test_series_buffer_scalar_series():
+    series = dh.SeriesBuffer()
+    for i in range(3):
+        series.append(i * 0.5)
+    assert series[0] == 0. and series[-1] == 1.
+    assert list(series) == [0., 0.5, 1.]
+    assert np.asarray(series).shape == (3,)
+
+
+def test_log_policy_kinds():
+    series = dh.SeriesBuffer()
+    assert [s for s in range(7) if dh.LogPolicy('every', 3).accept(s, (), series, 0.)] == [0, 3, 6]
+    assert not dh.LogPolicy('off', 0).accept(0, {'launch'}, series, 0.)
+    events = dh.LogPolicy('events', ('cpa', 'intercept'))
+    assert events.accept(5, {'cpa'}, series, 0.)
+    assert not events.accept(5, {'launch', 'max_g'}, series, 0.)
+    with pytest.raises(ValueError):
+        dh.LogPolicy('sometimes')
+    with pytest.raises(ValueError):
+        dh.LogPolicy('events', ('launch', 'boom'))
+    for kind, value in [('every', 0), ('every', -2), ('every', 1.5), ('change', -0.1)]:
+        with pytest.raises(ValueError):
+            dh.LogPolicy(kind, value)
+
+
+def test_log_policy_change_threshold():
+    policy = dh.LogPolicy('change', 0.5)
+    series = dh.SeriesBuffer(2)
+    logged = []
+    for step, sample in enumerate([(0., 0.), (0.3, 0.), (0.6, 0.), (0.6, -0.2), (0.6, 1.2)]):
+        if policy.accept(step, (), series, *sample):
+            series.write(*sample)
+            logged.append(step)
+    # differences are taken from the last stored sample, on the largest changing number
+    assert logged == [0, 2, 4]
+
+
+def test_simulator_events():
+    sim = _simulator()
+    missile, target = sim.m['player'], sim.t['player']
+    missile.acc = 0.
+    target.pos = missile.pos + (10., 0.)
+    sim.steps = 1
+    assert sim._events(False) == {'launch'}
+
+    found = []
+    for step, (acc, rng) in enumerate([(5., 8.), (3., 6.), (7., 5.), (1., 7.), (2., 9.),
+                                       (0., 4.)], 2):
+        missile.acc = acc
+        target.pos = missile.pos + (rng, 0.)
+        sim.steps = step
+        found.append(sim._events(step == 7))
+    assert found == [{'max_g'}, set(), {'max_g'}, {'cpa'}, set(), {'intercept'}]
+    assert sim._peak_step == 4
+
+
+def test_simulator_logs_with_policies():
+    sim = _simulator(log_policies={'acc': dh.LogPolicy('events', ('max_g',)),
+                                   'los': dh.LogPolicy('change', 1.),
+                                   'los_rate': dh.LogPolicy('off', 0)})
+    sim.loop()
+    acc = np.abs(np.asarray(dh.history['acc']))
+    assert len(acc) and np.all(np.diff(acc) > 0)
+    los = np.asarray(dh.history['los'])
+    assert 1 < len(los) < sim.steps
+    assert np.all(np.abs(np.diff(los, axis=0)).max(axis=1) > 1.)
+    assert len(dh.history['los_rate']) == 0
+    assert len(dh.history['los_angle']) > 0
+
+
+def test_replay_matches_live_states():
+    sim = _simulator(keyframe_interval=50)
+    sim.loop()
+    live = sim.m['player'].snapshot(), sim.t['player'].snapshot()
+    states = sim._plt_event.states
+    assert sim.steps > 120
+
+    for step in [1, 49, 50, 51, 99, 120, sim.steps - 1]:
+        sim._show_step(step)
+        assert sim._view_step == step
+        assert np.array_equal(sim.m['player'].state, states[step][0], equal_nan=True)
+        assert np.array_equal(sim.t['player'].state, states[step][1], equal_nan=True)
+
+    # resuming restores the live state
+    sim._suspended()
+    assert sim._live is None and sim._view_step is None
+    assert np.array_equal(sim.m['player'].state, live[0], equal_nan=True)
+    assert np.array_equal(sim.t['player'].state, live[1], equal_nan=True)
+
+
+def test_zoom_keys():
+    sim = _simulator()
+    view = sim._viewport
+    for name, factor in [('PLUS', 1.25), ('EQUALS', 1.25), ('KP_PLUS', 1.25), ('MINUS', 0.8),
+                         ('KP_MINUS', 0.8)]:
+        zoom = view.zoom
+        sim._viewport_key(viz.event_key(name))
+        assert np.isclose(view.zoom, zoom * factor)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# @Author: agent
+# @Date:   2026-10-20 12:50:00
+# @Last Modified by:   agent
+# @Last Modified time: 2026-10-20 12:50:00
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import visualizer as viz
+
+
+def test_viewport_to_pix():
+    view = viz.Viewport((800, 600), scale=2., offset=(10, 5))
+    assert view.to_pix((10, 5)).tolist() == [0, 600]
+    assert view.to_pix([[20, 15], [410, 305]]).tolist() == [[20, 580], [800, 0]]
+    assert view.to_pix(np.zeros((3, 4, 2))).shape == (3, 4, 2)
+
+
+def test_viewport_zoom_keeps_center():
+    view = viz.Viewport((800, 600), scale=2.)
+    center = sum(view.visible()) / 2
+    version = view.version
+    view.zoom_by(1.25)
+    lo, hi = view.visible()
+    assert np.allclose((lo + hi) / 2, center)
+    assert np.allclose(hi - lo, np.array([400., 300.]) / 1.25)
+    assert view.version == version + 1
+
+
+def test_viewport_follow():
+    view = viz.Viewport((800, 600), scale=2.)
+    assert not view.follow([[10, 10], [300, 200]])
+    assert view.version == 0
+
+    points = np.array([[-100., 50.], [900., 250.]])
+    assert view.follow(points, margin=0.25)
+    lo, hi = view.visible()
+    assert np.all(points.min(axis=0) >= lo) and np.all(points.max(axis=0) <= hi)
+    # zoomed out just enough to leave the margin around the widest side
+    assert np.isclose(hi[0] - lo[0], 1000 * 1.5)
+    assert np.allclose((lo + hi) / 2, [400., 150.])
+    assert view.version == 1
@@ -22,5 +22,5 @@ _conv_factors = {
 
 for desc, factor in _conv_factors.items():
     units = desc.split('_')
-    globals()['_to_'.join(units)] = lambda unit_1: unit_1 * factor
-    globals()['_to_'.join(reversed(units))] = lambda unit_2: unit_2 / factor
+    globals()['_to_'.join(units)] = lambda unit_1, factor=factor: unit_1 * factor
+    globals()['_to_'.join(reversed(units))] = lambda unit_2, factor=factor: unit_2 / factor
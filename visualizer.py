@@ -30,6 +30,8 @@ Allow to easily visualize simulation output.
 import pygame
 import numpy as np
 
+import decimation
+
 class Point:
     """
 ===============
@@ -117,22 +119,117 @@ The PlayerSurf class
         return Point((cntr_pos[0] - self.dim[0]/2, cntr_pos[1] + self.dim[1]/2))
 
 
+class Viewport:
+    """
+==================
+The Viewport class
+==================
+
+.. class:: Viewport(screen_size, scale=1., offset=(0, 0), zoom=1.)
+
+        Create a Viewport instance mapping world coordinates (bottom-left origin, e.g. meters) to
+        pygame screen pixels (top-left origin) for a :samp:`screen_size` screen.
+        World point :samp:`offset` is mapped to screen bottom left corner and one world unit
+        spans :samp:`scale` * :samp:`zoom` pixels.
+        The version attribute is incremented every time the mapping changes.
+
+    """
+    def __init__(self, screen_size, scale=1., offset=(0, 0), zoom=1.):
+        self.screen_size = screen_size
+        self.scale = scale
+        self.offset = np.array(offset, dtype=np.float64)
+        self.zoom = zoom
+        self.version = 0
+
+    def to_pix(self, points):
+        """
+.. method:: to_pix(points)
+
+        Convert :samp:`points` world coordinates, an array (or nested sequence) of shape
+        (..., 2), to an integer array of pixel coordinates with the same shape.
+
+        """
+        pix = (np.asarray(points, dtype=np.float64) - self.offset) * (self.scale * self.zoom)
+        pix[..., 1] = self.screen_size[1] - pix[..., 1]
+        return pix.astype(np.int64)
+
+    def visible(self):
+        """
+.. method:: visible()
+
+        Return (bottom left, top right) world coordinates of the visible area.
+
+        """
+        return self.offset, self.offset + np.array(self.screen_size) / (self.scale * self.zoom)
+
+    def pan(self, dx, dy):
+        """
+.. method:: pan(dx, dy)
+
+        Move the visible area by (:samp:`dx`, :samp:`dy`) world units.
+
+        """
+        self.offset = self.offset + (dx, dy)
+        self.version += 1
+
+    def zoom_by(self, factor):
+        """
+.. method:: zoom_by(factor)
+
+        Multiply zoom by :samp:`factor`, keeping the visible area center fixed.
+
+        """
+        center = sum(self.visible()) / 2
+        self.zoom *= factor
+        self.offset = center - np.array(self.screen_size) / (self.scale * self.zoom) / 2
+        self.version += 1
+
+    def follow(self, points, margin=0.25):
+        """
+.. method:: follow(points, margin=0.25)
+
+        Make sure every world point in :samp:`points` (shape (n, 2)) is visible: if one is
+        not, the visible area is centered on points bounding box and zoomed out, if needed,
+        to leave :samp:`margin` (a fraction of the box size) around it.
+        Return True if the mapping changed.
+
+        """
+        lo, hi = np.min(points, axis=0), np.max(points, axis=0)
+        vis_lo, vis_hi = self.visible()
+        if np.all(lo >= vis_lo) and np.all(hi <= vis_hi):
+            return False
+        span = np.maximum(hi - lo, 1e-9) * (1 + 2 * margin)
+        self.zoom = min(self.zoom, np.min(np.array(self.screen_size) / (span * self.scale)))
+        self.offset = (lo + hi) / 2 - np.array(self.screen_size) / (self.scale * self.zoom) / 2
+        self.version += 1
+        return True
+
+
 class SimScreen:
     """
 ===================
 The SimScreen class
 ===================
 
-.. class:: SimScreen(screen_size, font_size)
+.. class:: SimScreen(screen_size, font_size, dirty_rects=False, viewport=None)
 
         Create a SimScreen instance with :samp:`screen_size` screen size and :samp:`font_size`
         font size.
         It allows to easily manage pygame screen, used as simulation animation output screen, 
         through custom helper methods.
-        SimScreen coordinate frame origin is placed at bottom left corner.
+        SimScreen coordinate frame origin is placed at bottom left corner: drawing methods take
+        coordinates in this frame, converted to pixels through :samp:`viewport` Viewport
+        (by default a pixel to pixel mapping), available as the viewport attribute.
+
+        If :samp:`dirty_rects` is True only changed screen regions are redrawn: persistent lines
+        are drawn on a background surface too, clear() only restores the background under
+        last frame transient drawings (sprites, text, non persistent lines) and update() only
+        pushes the regions touched since previous update.
 
     """
-    def __init__(self, screen_size, font_size):
+    TEXT_CACHE_SIZE = 256
+
+    def __init__(self, screen_size, font_size, dirty_rects=False, viewport=None):
         pygame.init()
 
         pygame.font.init()
@@ -146,7 +243,17 @@ The SimScreen class
 
         self._screen_size = screen_size
         self._screen = pygame.display.set_mode(screen_size)
-        self.clear()
+        self.viewport = viewport if viewport is not None else Viewport(screen_size)
+
+        self.dirty_rects = dirty_rects
+        self._transient = []
+        self._restored = []
+        self._dirty = []
+        self._hud = {}
+        self._text_cache = {}
+        self._glyphs = {}
+        self._background = self._screen.copy()
+        self.reset()
 
     def _init_colors(self):
         self.colors = {
@@ -162,10 +269,37 @@ The SimScreen class
         """
 .. method:: clear()
 
-        Clear simulation screen.
+        Clear simulation screen (only last frame transient drawings in dirty rects mode).
+
+        """
+        if not self.dirty_rects:
+            self._screen.fill(self.colors['white'])
+            return
+        for rect in self._transient:
+            self._screen.blit(self._background, rect, rect)
+        self._dirty.extend(self._transient)
+        self._restored = self._transient
+        self._transient = []
+
+    def reset(self):
+        """
+.. method:: reset()
+
+        Clear the whole simulation screen, persistent drawings included.
 
         """
         self._screen.fill(self.colors['white'])
+        self._background.fill(self.colors['white'])
+        self._transient = []
+        self._hud = {}
+        self._last_persistent = None
+        self._dirty.append(self._screen.get_rect())
+
+    def _touched(self, rect, persistent=False):
+        if self.dirty_rects:
+            self._dirty.append(rect)
+            if not persistent:
+                self._transient.append(rect)
 
     def update(self):
         """
@@ -174,32 +308,85 @@ The SimScreen class
         Update simulation screen: must be called to make screen changes effective.
 
         """
-        pygame.display.flip()
+        if self.dirty_rects:
+            pygame.display.update(self._dirty)
+            self._dirty = []
+        else:
+            pygame.display.flip()
 
-    def _pgs2ss_coords(self, pos):
+    def draw_line(self, color, point0, point1, persistent=False):
         """
-.. method:: _pgs2ss_coords(pos)
+.. method:: draw_line(color, point0, point1, persistent=False)
 
-        (_pygamescreen2simscreen_coords)
+        Draw a colored line from :samp:`point0` to :samp:`point1` (Point objects or coordinates
+        tuples), where :samp:`color` is a string from the following list::
 
-        Convert :samp:`pos` Point object coordinates from pygame screen frame (top-left origin) to
-        SimScreen frame (bottom-left origin) returning a coordinates tuple.
+            ['grey', 'black', 'white', 'blue', 'green', 'red']
 
-        """
-        return Point((pos.coords[0], self._screen_size[1] - pos.coords[1])).int_coords()
+        In dirty rects mode a :samp:`persistent` line is also drawn on the background, so that
+        it is not erased by clear().
 
-    def draw_line(self, color, point0, point1):
         """
-.. method:: draw_line(color, point0, point1)
+        self.draw_segments(color, [getattr(point0, 'coords', point0)],
+                           [getattr(point1, 'coords', point1)], persistent)
 
-        Draw a colored line from :samp:`point0` to :samp:`point1`, where :samp:`color` is a string
-        from the following list::
+    def draw_segments(self, color, points0, points1, persistent=False):
+        """
+.. method:: draw_segments(color, points0, points1, persistent=False)
 
-            ['grey', 'black', 'white', 'blue', 'green', 'red']
+        Draw colored lines from every point in :samp:`points0` to the corresponding one in
+        :samp:`points1` (arrays of shape (n, 2)), like draw_line.
+        Coordinates of all points are converted to pixels at once and lines falling on the same
+        pixels of the previous one (or of the last persistent line drawn) are skipped.
 
         """
-        pygame.draw.line(self._screen, self.colors[color], 
-                self._pgs2ss_coords(point0), self._pgs2ss_coords(point1))
+        pix0, pix1 = self.viewport.to_pix(points0), self.viewport.to_pix(points1)
+        keep = decimation.distinct_pixels(pix0, pix1)
+        pix0, pix1 = pix0[keep].tolist(), pix1[keep].tolist()
+        if persistent and pix0:
+            if [pix0[0], pix1[0]] == self._last_persistent:
+                pix0, pix1 = pix0[1:], pix1[1:]
+            if pix0:
+                self._last_persistent = [pix0[-1], pix1[-1]]
+        rgb = self.colors[color]
+        for p0, p1 in zip(pix0, pix1):
+            rect = pygame.draw.line(self._screen, rgb, p0, p1)
+            if self.dirty_rects and persistent:
+                pygame.draw.line(self._background, rgb, p0, p1)
+            self._touched(rect, persistent)
+
+    def _render(self, text):
+        surf = self._text_cache.get(text)
+        if surf is None:
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surf = self._text_cache[text] = self._font.render(text, False, self.colors['black'])
+        return surf
+
+    def _glyph(self, char):
+        surf = self._glyphs.get(char)
+        if surf is None:
+            surf = self._glyphs[char] = self._font.render(char, False, self.colors['black'])
+        return surf
+
+    def _display_hud(self, level, key, surfaces):
+        pos = [20, int(self._font_size * 1.7) * (level + 1)]
+        if self.dirty_rects:
+            prev = self._hud.get(level)
+            if prev is not None:
+                # unchanged and not overwritten by clear(): nothing to redraw
+                if prev[0] == key and prev[1].collidelist(self._restored) == -1:
+                    return
+                self._screen.blit(self._background, prev[1], prev[1])
+                self._dirty.append(prev[1])
+
+        rect = pygame.Rect(pos, (0, 0))
+        for surf in surfaces:
+            rect.union_ip(self._screen.blit(surf, pos))
+            pos[0] += surf.get_width()
+        if self.dirty_rects:
+            self._dirty.append(rect)
+            self._hud[level] = (key, rect)
 
     def display_text(self, text, level=0):
         """
@@ -208,37 +395,36 @@ The SimScreen class
         Display string :samp:`text` on SimScreen.
         :samp:`level` is an integer indicating where to display :samp:`text` vertically, starting 
         from the top.
+        Rendered strings are cached, and in dirty rects mode text already displayed at
+        :samp:`level` is not drawn again.
+
+        """
+        self._display_hud(level, text, [self._render(text)])
+
+    def display_readout(self, label, value, level=0, decimals=2):
+        """
+.. method:: display_readout(label, value, level=0, decimals=2)
+
+        Display string :samp:`label` followed by :samp:`value` number with :samp:`decimals`
+        decimal digits, like display_text.
+        The number is composed from cached glyphs, so that a readout changing every frame does
+        not need font rendering.
 
         """
-        textsurface = self._font.render(text, False, (0, 0, 0))
-        self._screen.blit(textsurface, (20, int(self._font_size * 1.7) * (level + 1)))
+        digits = '%.*f' % (decimals, value)
+        self._display_hud(level, label + digits,
+                          [self._render(label)] + [self._glyph(c) for c in digits])
 
-    def blit_center(self, psurf, cntr_pos, ori):
+    def blit_center(self, psurf, cntr_pos):
         """
-.. method:: blit_center(psurf, cntr_pos, ori)
+.. method:: blit_center(psurf, cntr_pos)
 
         Blit a :samp:`psurf` PlayerSurf object to SimScreen given surface desired center coordinates
-        (as a tuple) and orientation (in radians).
-
-        """
-        top_left = psurf.cntr2tl(cntr_pos)
-        if ori:
-            dori = np.degrees(ori)
-            if dori > 360:
-                raise Exception
-            pxh = psurf.dim[0]/2
-            pyh = psurf.dim[1]/2
-            if dori > 180:
-                dori -= 180
-                ori -= np.pi
-            # rotated around center and traslated
-            if dori < 90:
-                tlc, trc = Point((-pxh, pyh)).rotate(ori), Point((pxh, pyh)).rotate(ori)
-                top_left += Point((abs(-pxh - tlc.coords[0]), -pyh + trc.coords[1]))
-            else:
-                trc, brc = Point((pxh, pyh)).rotate(ori), Point((pxh, -pyh)).rotate(ori)
-                top_left += Point((abs(-pxh - trc.coords[0]), -pyh + brc.coords[1]))
-        self._screen.blit(psurf.surf, self._pgs2ss_coords(top_left))
+        (as a tuple).
+
+        """
+        rect = psurf.surf.get_rect(center=self.viewport.to_pix(cntr_pos).tolist())
+        self._touched(self._screen.blit(psurf.surf, rect))
 
 def event_type(event):
     """